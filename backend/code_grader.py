@@ -0,0 +1,397 @@
+"""
+Sandboxed grading of coding question submissions
+
+The server keeps a pool of long-lived grader worker processes started from this
+file. A worker imports nothing but the standard library and forks a fresh child
+for every submission, so a job pays for a fork instead of an interpreter start.
+Workers start with an empty environment, so no server secret is inherited. The
+child enters new mount and network namespaces, chroots into an empty
+directory, drops to an unprivileged uid and to CPU time, address space, file
+size, open file and process limits, and only then executes the submitted code
+against the question's test cases. The isolation comes from the kernel: if
+the child cannot set it up, the job fails rather than run unconfined. An audit
+hook refusing sockets, processes and ctypes is kept as a second layer only.
+Results are returned to the server as JSON lines and never echo a hidden
+test's inputs or outputs, nor an exception's message. The sandbox protects
+the host; code running in the child can still tamper with its own verdict, so
+grades are for practice, not for anything high-stakes.
+
+The server side, CodeGraderPool, hands jobs to idle workers, replaces workers
+that die or hang, and caches results by a hash of (question, tests, code).
+"""
+
+import asyncio
+import ctypes
+import hashlib
+import json
+import os
+import select
+import signal
+import sys
+import tempfile
+import time
+from collections import OrderedDict, deque
+
+STATUS_ACCEPTED = "accepted"
+STATUS_WRONG_ANSWER = "wrong_answer"
+STATUS_COMPILE_ERROR = "compile_error"
+STATUS_RUNTIME_ERROR = "runtime_error"
+STATUS_TIME_LIMIT = "time_limit_exceeded"
+STATUS_MEMORY_LIMIT = "memory_limit_exceeded"
+STATUS_INTERNAL_ERROR = "internal_error"
+
+MAX_RESULT_BYTES = 64 * 1024
+
+# Audit events refused inside the sandbox once the submitted code starts running
+BLOCKED_AUDIT_EVENTS = (
+    "socket.",
+    "subprocess.",
+    "os.system",
+    "os.exec",
+    "os.posix_spawn",
+    "os.spawn",
+    "os.fork",
+    "os.kill",
+    "os.chdir",
+    "os.chmod",
+    "os.chown",
+    "os.link",
+    "os.mkdir",
+    "os.putenv",
+    "os.remove",
+    "os.rename",
+    "os.rmdir",
+    "os.symlink",
+    "os.truncate",
+    "os.unsetenv",
+    "ctypes.",
+)
+
+# The child runs as nobody; RLIMIT_NPROC only binds a non-root uid
+SANDBOX_UID = 65534
+SANDBOX_GID = 65534
+CLONE_NEWNS = 0x00020000
+CLONE_NEWUSER = 0x10000000
+CLONE_NEWNET = 0x40000000
+
+# Nothing can be imported once the child is chrooted, so the modules submissions
+# may use are loaded by the worker beforehand
+PRELOADED_MODULES = (
+    "bisect", "collections", "dataclasses", "decimal", "fractions", "functools", "heapq",
+    "itertools", "math", "operator", "random", "re", "statistics", "string", "typing"
+)
+
+# Worker side
+
+def _unshare(flags):
+    libc = ctypes.CDLL(None, use_errno=True)
+    if libc.unshare(flags) != 0:
+        errno = ctypes.get_errno()
+        raise OSError(errno, os.strerror(errno))
+
+def _isolate(workdir):
+    """
+    Confine the forked child with the kernel: private mount and network
+    namespaces, an empty root directory and, when started as root, the
+    unprivileged sandbox uid. Without root a user namespace provides the
+    privilege to chroot. Any failure propagates, so nothing runs unconfined.
+    """
+    if os.geteuid() == 0:
+        _unshare(CLONE_NEWNS | CLONE_NEWNET)
+        os.chroot(workdir)
+        os.chdir("/")
+        os.setgroups([])
+        os.setgid(SANDBOX_GID)
+        os.setuid(SANDBOX_UID)
+    else:
+        _unshare(CLONE_NEWUSER | CLONE_NEWNS | CLONE_NEWNET)
+        os.chroot(workdir)
+        os.chdir("/")
+
+def _restrict(time_limit, memory_mb, workdir):
+    """Isolate the forked child and apply resource limits"""
+    import resource
+
+    _isolate(workdir)
+
+    cpu_seconds = max(1, int(time_limit + 0.999))
+    resource.setrlimit(resource.RLIMIT_CPU, (cpu_seconds, cpu_seconds + 1))
+    memory = memory_mb * 1024 * 1024
+    resource.setrlimit(resource.RLIMIT_AS, (memory, memory))
+    resource.setrlimit(resource.RLIMIT_FSIZE, (0, 0))
+    resource.setrlimit(resource.RLIMIT_NOFILE, (16, 16))
+    resource.setrlimit(resource.RLIMIT_NPROC, (0, 0))
+    resource.setrlimit(resource.RLIMIT_CORE, (0, 0))
+
+    def audit(event, args):
+        if event.startswith(BLOCKED_AUDIT_EVENTS):
+            raise PermissionError(f"{event} is not allowed")
+
+    sys.addaudithook(audit)
+
+def _run_tests(code, function, tests):
+    """Execute the submission and run every test case; runs inside the sandbox"""
+    namespace = {"__name__": "submission"}
+    try:
+        compiled = compile(code, "<submission>", "exec")
+    except SyntaxError as e:
+        return {"status": STATUS_COMPILE_ERROR, "error": f"{e.msg} (line {e.lineno})"}
+    try:
+        exec(compiled, namespace)
+    except MemoryError:
+        return {"status": STATUS_MEMORY_LIMIT}
+    except BaseException as e:
+        return {"status": STATUS_RUNTIME_ERROR, "error": type(e).__name__}
+
+    func = namespace.get(function)
+    if not callable(func):
+        return {"status": STATUS_COMPILE_ERROR, "error": f"function {function}() is not defined"}
+
+    # Test inputs and outputs are hidden: a failure reports which test failed and,
+    # for an exception, only its type, so code cannot smuggle data out in a message
+    passed = 0
+    for index, test in enumerate(tests):
+        try:
+            output = func(*test["args"])
+        except MemoryError:
+            return {"status": STATUS_MEMORY_LIMIT, "passed": passed, "total": len(tests), "failed_test": index}
+        except BaseException as e:
+            return {
+                "status": STATUS_RUNTIME_ERROR,
+                "passed": passed,
+                "total": len(tests),
+                "failed_test": index,
+                "error": type(e).__name__
+            }
+        if output != test["expected"]:
+            return {"status": STATUS_WRONG_ANSWER, "passed": passed, "total": len(tests), "failed_test": index}
+        passed += 1
+    return {"status": STATUS_ACCEPTED, "passed": passed, "total": len(tests)}
+
+def _grade_in_child(job, workdir):
+    """Fork a sandboxed child for one job and collect its result"""
+    read_fd, write_fd = os.pipe()
+    started = time.perf_counter()
+    pid = os.fork()
+    if pid == 0:
+        os.close(read_fd)
+        # Keep submission output away from the worker's job and result pipes
+        devnull = os.open(os.devnull, os.O_RDWR)
+        for fd in (0, 1, 2):
+            os.dup2(devnull, fd)
+        try:
+            _restrict(job["time_limit"], job["memory_mb"], workdir)
+            result = _run_tests(job["code"], job["function"], job["tests"])
+            payload = json.dumps(result, default=repr).encode()[:MAX_RESULT_BYTES]
+        except MemoryError:
+            payload = json.dumps({"status": STATUS_MEMORY_LIMIT}).encode()
+        except BaseException:
+            payload = json.dumps({"status": STATUS_INTERNAL_ERROR, "error": "sandbox setup failed"}).encode()
+        os.write(write_fd, payload)
+        os._exit(0)
+
+    os.close(write_fd)
+    chunks = []
+    deadline = started + job["time_limit"] * 2 + 1
+    timed_out = False
+    while True:
+        remaining = deadline - time.perf_counter()
+        if remaining <= 0:
+            timed_out = True
+            break
+        ready, _, _ = select.select([read_fd], [], [], remaining)
+        if not ready:
+            continue
+        chunk = os.read(read_fd, 65536)
+        if not chunk:
+            break
+        chunks.append(chunk)
+    os.close(read_fd)
+    if timed_out:
+        os.kill(pid, signal.SIGKILL)
+    _, status = os.waitpid(pid, 0)
+
+    elapsed_ms = round((time.perf_counter() - started) * 1000, 2)
+    if timed_out or (os.WIFSIGNALED(status) and os.WTERMSIG(status) in (signal.SIGXCPU, signal.SIGKILL)):
+        return {"status": STATUS_TIME_LIMIT, "elapsed_ms": elapsed_ms}
+    try:
+        result = json.loads(b"".join(chunks))
+    except ValueError:
+        result = {"status": STATUS_RUNTIME_ERROR, "error": "submission exited without a result"}
+    result["elapsed_ms"] = elapsed_ms
+    return result
+
+def worker_main():
+    """Serve grading jobs read as JSON lines from stdin until it closes"""
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    sys.dont_write_bytecode = True
+    for module in PRELOADED_MODULES:
+        __import__(module)
+    workdir = tempfile.mkdtemp(prefix="grader-")
+    sys.stdout.write(json.dumps({"ready": True}) + "\n")
+    sys.stdout.flush()
+    for line in sys.stdin:
+        try:
+            result = _grade_in_child(json.loads(line), workdir)
+        except Exception as e:
+            result = {"status": STATUS_INTERNAL_ERROR, "error": str(e)[:200]}
+        sys.stdout.write(json.dumps(result) + "\n")
+        sys.stdout.flush()
+
+# Server side
+
+def submission_key(question_id, tests, code):
+    """Cache key of a submission: the question, its current tests and the code"""
+    digest = hashlib.sha256()
+    for part in (question_id, json.dumps(tests, sort_keys=True), code):
+        digest.update(part.encode())
+        digest.update(b"\0")
+    return digest.hexdigest()
+
+class CodeGraderPool:
+    """
+    Pool of pre-started grader workers with a result cache.
+
+    ``grade`` waits for an idle worker, so at most ``workers`` submissions run
+    at once and the rest queue. Identical submissions share one run: results
+    are cached by submission_key and concurrent duplicates await the same job.
+    """
+
+    def __init__(self, workers=2, time_limit=2.0, memory_mb=256, cache_size=2048):
+        self.workers = workers
+        self.time_limit = time_limit
+        self.memory_mb = memory_mb
+        self.cache_size = cache_size
+        self._cache = OrderedDict()
+        self._inflight = {}
+        self._idle = None
+        self._waiters = deque()
+        self._procs = []
+        self.stats = {"graded": 0, "cache_hits": 0, "worker_restarts": 0}
+
+    def snapshot(self):
+        return {**self.stats, "workers": self.workers, "cached_results": len(self._cache), "in_flight": len(self._inflight)}
+
+    async def _spawn(self):
+        # -I: isolated mode, the worker ignores PYTHON* env vars and the user site.
+        # An empty environment keeps the server's secrets out of the sandbox.
+        proc = await asyncio.create_subprocess_exec(
+            sys.executable, "-I", os.path.abspath(__file__), "--worker",
+            stdin=asyncio.subprocess.PIPE,
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.DEVNULL,
+            env={},
+            cwd=tempfile.gettempdir()
+        )
+        # Wait for the interpreter to come up so no submission pays for its startup
+        await proc.stdout.readline()
+        return proc
+
+    async def start(self):
+        if self._idle is not None:
+            return
+        self._idle = []
+        self._procs = list(await asyncio.gather(*(self._spawn() for _ in range(self.workers))))
+        self._idle.extend(self._procs)
+
+    async def close(self):
+        if self._idle is None:
+            return
+        for proc in self._procs:
+            if proc.returncode is None:
+                proc.stdin.close()
+        for proc in self._procs:
+            try:
+                await asyncio.wait_for(proc.wait(), timeout=5)
+            except asyncio.TimeoutError:
+                proc.kill()
+        self._procs = []
+        self._idle = None
+
+    async def _replace(self, proc):
+        if proc.returncode is None:
+            proc.kill()
+            await proc.wait()
+        self._procs.remove(proc)
+        replacement = await self._spawn()
+        self._procs.append(replacement)
+        self.stats["worker_restarts"] += 1
+        return replacement
+
+    async def _acquire(self):
+        if self._idle and not self._waiters:
+            return self._idle.pop()
+        waiter = asyncio.get_running_loop().create_future()
+        self._waiters.append(waiter)
+        try:
+            return await waiter
+        except asyncio.CancelledError:
+            if waiter.done() and not waiter.cancelled():
+                self._release(waiter.result())
+            raise
+
+    def _release(self, proc):
+        # Hand the worker straight to the longest waiting submission, so a
+        # client that loops on grade() cannot keep taking it back first
+        while self._waiters:
+            waiter = self._waiters.popleft()
+            if not waiter.done():
+                waiter.set_result(proc)
+                return
+        self._idle.append(proc)
+
+    async def _run(self, job):
+        await self.start()
+        proc = await self._acquire()
+        try:
+            proc.stdin.write((json.dumps(job) + "\n").encode())
+            await proc.stdin.drain()
+            line = await asyncio.wait_for(proc.stdout.readline(), timeout=self.time_limit * 2 + 5)
+            if not line:
+                raise ConnectionError("grader worker exited")
+            return json.loads(line)
+        except (asyncio.TimeoutError, ConnectionError, BrokenPipeError, ValueError):
+            proc = await self._replace(proc)
+            return {"status": STATUS_INTERNAL_ERROR, "error": "grader worker failed"}
+        finally:
+            self._release(proc)
+
+    async def grade(self, question_id, function, tests, code):
+        """Grade ``code`` against ``tests``; returns the result dict and whether it was cached"""
+        key = submission_key(question_id, tests, code)
+        if key in self._cache:
+            self._cache.move_to_end(key)
+            self.stats["cache_hits"] += 1
+            return self._cache[key], True
+        if key in self._inflight:
+            self.stats["cache_hits"] += 1
+            return await asyncio.shield(self._inflight[key]), True
+
+        future = asyncio.get_running_loop().create_future()
+        self._inflight[key] = future
+        try:
+            result = await self._run({
+                "code": code,
+                "function": function,
+                "tests": tests,
+                "time_limit": self.time_limit,
+                "memory_mb": self.memory_mb
+            })
+            future.set_result(result)
+        except BaseException as e:
+            future.set_exception(e)
+            future.exception()  # retrieved here; duplicates awaiting it still see it
+            raise
+        finally:
+            del self._inflight[key]
+
+        self.stats["graded"] += 1
+        # Infrastructure failures are retried on the next submission rather than cached
+        if result["status"] != STATUS_INTERNAL_ERROR:
+            self._cache[key] = result
+            if len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+        return result, False
+
+if __name__ == "__main__" and "--worker" in sys.argv:
+    worker_main()
@@ -0,0 +1,54 @@
+#!/usr/bin/env python3
+"""
+One-off data migrations
+
+Runs the backfills that bring documents written by older releases up to the
+current schema. Each migration records its completion in job_checkpoints, so a
+rerun skips the ones already applied. Run it once after deploying a release
+that adds a migration; the API servers no longer backfill on startup.
+
+Usage: python backend/migrate.py [--rerun NAME ...]
+"""
+
+import argparse
+import asyncio
+import time
+from datetime import datetime, timezone
+
+import server
+
+# Applied in order; later migrations may rely on the earlier ones
+MIGRATIONS = {
+    "backfill_task_owners": server.backfill_task_owners,
+    "backfill_project_task_counts": server.backfill_project_task_counts,
+    "backfill_updated_at": server.backfill_updated_at,
+    "backfill_due_dates": server.backfill_due_dates,
+    "backfill_quiz_stats": server.backfill_quiz_stats
+}
+
+def job_id(name):
+    return f"migration:{name}"
+
+async def run(rerun):
+    db = server.db
+    for name, migration in MIGRATIONS.items():
+        done = await db.job_checkpoints.find_one({"id": job_id(name), "completed_at": {"$ne": None}}, {"_id": 1})
+        if done and name not in rerun:
+            print(f"{name}: already applied")
+            continue
+        started = time.perf_counter()
+        await migration()
+        await db.job_checkpoints.update_one(
+            {"id": job_id(name)},
+            {"$set": {"completed_at": datetime.now(timezone.utc).isoformat()}},
+            upsert=True
+        )
+        print(f"{name}: applied in {time.perf_counter() - started:.1f}s")
+    server.client.close()
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Apply pending one-off data migrations")
+    parser.add_argument("--rerun", nargs="+", default=[], choices=list(MIGRATIONS), metavar="NAME",
+                        help="apply these migrations again even if already recorded")
+    args = parser.parse_args()
+    asyncio.run(run(set(args.rerun)))
@@ -0,0 +1,181 @@
+#!/usr/bin/env python3
+"""
+Offline re-scoring of stored interview responses
+
+Streams interview sessions whose scoring_version is older than
+server.INTERVIEW_SCORING_VERSION, re-runs analyze_interview_response on a
+process pool and writes the new feedback and session aggregates back with
+batched bulk_write calls. Progress is checkpointed in job_checkpoints so an
+interrupted run resumes where it stopped.
+
+Each write only matches the bucket or session as it was read: a bucket by its
+response count, a session by its aggregates count. A session that received
+answers in between keeps its old scoring_version, so a later run picks it up.
+
+Usage: python backend/rescore_interviews.py [--batch-size 200] [--workers N] [--restart]
+"""
+
+import argparse
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime, timezone, timedelta
+
+from pymongo import MongoClient, UpdateOne
+
+import server
+
+JOB_ID = "rescore_interviews"
+
+def rescore_session(payload):
+    """Re-score one session's responses; runs in a worker process"""
+    interview_type, responses = payload
+    feedbacks = server.score_interview_responses(responses, interview_type)
+    return [{**response, "feedback": feedback} for response, feedback in zip(responses, feedbacks)]
+
+def load_checkpoint(db, version, restart):
+    checkpoint = db.job_checkpoints.find_one({"id": JOB_ID})
+    if restart or not checkpoint or checkpoint.get("scoring_version") != version:
+        return None, 0
+    return checkpoint.get("last_id"), checkpoint.get("processed", 0)
+
+def save_checkpoint(db, version, last_id, processed):
+    db.job_checkpoints.update_one(
+        {"id": JOB_ID},
+        {"$set": {
+            "scoring_version": version,
+            "last_id": last_id,
+            "processed": processed,
+            "updated_at": datetime.now(timezone.utc).isoformat()
+        }},
+        upsert=True
+    )
+
+def rescore_batch(db, pool, workers, sessions, version):
+    """
+    Re-score a batch of sessions and persist it; returns the number of
+    responses re-scored and the number of sessions skipped because they
+    changed while being re-scored
+    """
+    session_ids = [session["id"] for session in sessions]
+    buckets = {session_id: [] for session_id in session_ids}
+    for bucket in db.interview_responses.find(
+        {"session_id": {"$in": session_ids}},
+        {"_id": 1, "session_id": 1, "count": 1, "responses": 1}
+    ).sort("created_at", 1):
+        buckets[bucket["session_id"]].append(bucket)
+
+    # One work item per session: legacy embedded responses first, then bucket order
+    payloads = [
+        (session["type"], session.get("responses", []) + [r for b in buckets[session["id"]] for r in b.get("responses", [])])
+        for session in sessions
+    ]
+    chunksize = max(1, len(payloads) // (workers * 4))
+    results = list(pool.map(rescore_session, payloads, chunksize=chunksize))
+
+    bucket_ops = []
+    session_ops = []
+    skipped = 0
+    rescored_responses = 0
+    for session, rescored in zip(sessions, results):
+        # A submit moves the aggregates before it stores the responses, so a count
+        # ahead of the responses read means one was in flight: leave the session alone
+        aggregate_count = (session.get("aggregates") or {}).get("count")
+        if aggregate_count is not None and aggregate_count != len(rescored):
+            skipped += 1
+            continue
+        rescored_responses += len(rescored)
+        legacy_count = len(session.get("responses", []))
+        offset = legacy_count
+        for bucket in buckets[session["id"]]:
+            size = len(bucket.get("responses", []))
+            bucket_ops.append(UpdateOne(
+                {"_id": bucket["_id"], "count": bucket.get("count")},
+                {"$set": {"responses": rescored[offset:offset + size]}}
+            ))
+            offset += size
+
+        session_update = {
+            "aggregates": server.build_interview_aggregates(rescored),
+            "scoring_version": version
+        }
+        if legacy_count:
+            session_update["responses"] = rescored[:legacy_count]
+        session_ops.append(UpdateOne(
+            {"_id": session["_id"], "aggregates.count": aggregate_count},
+            {"$set": session_update}
+        ))
+
+    # Buckets first: a crash before the session write, or a submit that makes the
+    # session write miss, leaves the session at the old version, so it is simply
+    # picked up again on the next run
+    if bucket_ops:
+        db.interview_responses.bulk_write(bucket_ops, ordered=False)
+    if session_ops:
+        skipped += len(session_ops) - db.interview_sessions.bulk_write(session_ops, ordered=False).matched_count
+    return rescored_responses, skipped
+
+def run(batch_size, workers, restart, min_age_minutes):
+    mongo = MongoClient(os.environ["MONGO_URL"])
+    db = mongo[os.environ["DB_NAME"]]
+    version = server.INTERVIEW_SCORING_VERSION
+
+    last_id, processed = load_checkpoint(db, version, restart)
+    # Leave sessions that may still be receiving answers to the live write path
+    cutoff = (datetime.now(timezone.utc) - timedelta(minutes=min_age_minutes)).isoformat()
+    query = {"scoring_version": {"$ne": version}, "created_at": {"$lt": cutoff}}
+    if last_id is not None:
+        query["_id"] = {"$gt": last_id}
+        print(f"Resuming after {last_id} ({processed} sessions already re-scored)")
+
+    cursor = db.interview_sessions.find(
+        query,
+        {"_id": 1, "id": 1, "type": 1, "responses": 1, "aggregates.count": 1}
+    ).sort("_id", 1).batch_size(batch_size)
+
+    started = time.perf_counter()
+    run_sessions = 0
+    run_responses = 0
+    run_skipped = 0
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        batch = []
+        for session in cursor:
+            batch.append(session)
+            if len(batch) < batch_size:
+                continue
+            responses, skipped = rescore_batch(db, pool, workers, batch, version)
+            run_responses += responses
+            run_skipped += skipped
+            run_sessions += len(batch) - skipped
+            processed += len(batch) - skipped
+            save_checkpoint(db, version, batch[-1]["_id"], processed)
+            elapsed = time.perf_counter() - started
+            print(f"{run_sessions} sessions, {run_responses} responses - "
+                  f"{run_sessions / elapsed:.1f} sessions/s, {run_responses / elapsed:.1f} responses/s")
+            batch = []
+        if batch:
+            responses, skipped = rescore_batch(db, pool, workers, batch, version)
+            run_responses += responses
+            run_skipped += skipped
+            run_sessions += len(batch) - skipped
+            processed += len(batch) - skipped
+            save_checkpoint(db, version, batch[-1]["_id"], processed)
+
+    elapsed = time.perf_counter() - started
+    rate = run_sessions / elapsed if elapsed else 0
+    print(f"Done: {run_sessions} sessions ({run_responses} responses) re-scored to version {version} "
+          f"in {elapsed:.1f}s, {rate:.1f} sessions/s")
+    if run_skipped:
+        # They lie behind the checkpoint, so the next run starts from the beginning
+        db.job_checkpoints.delete_one({"id": JOB_ID})
+        print(f"{run_skipped} sessions changed while being re-scored and were left for the next run")
+    mongo.close()
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Re-score stored interview responses with the current analyzer")
+    parser.add_argument("--batch-size", type=int, default=200, help="sessions per bulk_write batch")
+    parser.add_argument("--workers", type=int, default=os.cpu_count(), help="scoring worker processes")
+    parser.add_argument("--restart", action="store_true", help="ignore the saved checkpoint")
+    parser.add_argument("--min-age-minutes", type=int, default=60, help="skip sessions newer than this")
+    args = parser.parse_args()
+    run(args.batch_size, args.workers, args.restart, args.min_age_minutes)
@@ -1,4 +1,5 @@
-from fastapi import FastAPI, APIRouter, HTTPException, UploadFile, File, Form, Depends
+from fastapi import FastAPI, APIRouter, HTTPException, UploadFile, File, Form, Depends, Response
+from fastapi.responses import StreamingResponse
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from dotenv import load_dotenv
 from starlette.middleware.cors import CORSMiddleware
@@ -17,7 +18,27 @@ import bcrypt
 import jwt
 import json
 import base64
+import asyncio
 from bson import ObjectId
+from pymongo import ReturnDocument, InsertOne, UpdateOne, DeleteOne
+from pymongo.errors import BulkWriteError, CollectionInvalid, OperationFailure
+from pymongo.write_concern import WriteConcern
+from pymongo.monitoring import ConnectionPoolListener, ConnectionCheckOutFailedReason, CommandListener
+from prometheus_client import (
+    CONTENT_TYPE_LATEST, REGISTRY, CollectorRegistry, Counter, Gauge, Histogram, generate_latest, multiprocess
+)
+from prometheus_client.core import CounterMetricFamily, GaugeMetricFamily
+from starlette.routing import Match
+from starlette.datastructures import MutableHeaders
+import time
+import random
+import threading
+import importlib.util
+import functools
+import contextvars
+from itertools import product
+from collections import deque
+from code_grader import CodeGraderPool
 import PyPDF2
 import docx
 from io import BytesIO
@@ -26,8 +47,265 @@ ROOT_DIR = Path(__file__).parent
 load_dotenv(ROOT_DIR / '.env')
 
 # MongoDB connection
+MONGO_POOL_ENV_OPTIONS = (
+    ("MONGO_MAX_POOL_SIZE", "maxPoolSize"),
+    ("MONGO_MIN_POOL_SIZE", "minPoolSize"),
+    ("MONGO_MAX_CONNECTING", "maxConnecting"),
+    ("MONGO_MAX_IDLE_TIME_MS", "maxIdleTimeMS"),
+    ("MONGO_WAIT_QUEUE_TIMEOUT_MS", "waitQueueTimeoutMS"),
+    ("MONGO_SERVER_SELECTION_TIMEOUT_MS", "serverSelectionTimeoutMS"),
+    ("MONGO_CONNECT_TIMEOUT_MS", "connectTimeoutMS"),
+    ("MONGO_SOCKET_TIMEOUT_MS", "socketTimeoutMS")
+)
+# Preferred first; zstd and snappy need the zstandard and python-snappy packages
+MONGO_COMPRESSORS = (("zstd", "zstandard"), ("snappy", "snappy"), ("zlib", "zlib"))
+
+def mongo_client_options():
+    """
+    Connection pool options from MONGO_* environment variables; unset ones
+    keep the driver defaults or whatever MONGO_URL specifies. Wire compression
+    is off unless MONGO_COMPRESSORS lists compressors, or is "auto" for every
+    compressor whose module is installed; the server picks the first one it
+    also supports.
+    """
+    options = {option: int(os.environ[env]) for env, option in MONGO_POOL_ENV_OPTIONS if os.environ.get(env)}
+    compressors = os.environ.get("MONGO_COMPRESSORS", "")
+    if compressors == "auto":
+        compressors = ",".join(name for name, module in MONGO_COMPRESSORS if importlib.util.find_spec(module))
+    if compressors:
+        options["compressors"] = compressors
+    return options
+
+class PoolMetrics(ConnectionPoolListener):
+    """
+    CMAP listener tracking connection pool use across all servers.
+    
+    Motor runs the driver in worker threads, so a checkout's start and end are
+    matched through a thread-local and counters are updated under a lock.
+    Checkouts that wait ``slow_checkout_ms`` or more are counted as slow, and
+    wait queue timeouts are counted and logged as pool exhaustion.
+    """
+    
+    def __init__(self, slow_checkout_ms=10):
+        self.slow_checkout_ms = slow_checkout_ms
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self.checked_out = 0
+        self.max_checked_out = 0
+        self.wait_ms_total = 0.0
+        self.wait_ms_max = 0.0
+        self.counters = {
+            "connections_created": 0,
+            "connections_closed": 0,
+            "checkouts": 0,
+            "slow_checkouts": 0,
+            "checkout_failures": 0,
+            "pool_exhausted": 0,
+            "pool_clears": 0
+        }
+    
+    def connection_check_out_started(self, event):
+        self._local.started = time.perf_counter()
+    
+    def connection_checked_out(self, event):
+        started = getattr(self._local, "started", None)
+        wait_ms = (time.perf_counter() - started) * 1000 if started is not None else 0.0
+        with self._lock:
+            self.counters["checkouts"] += 1
+            self.checked_out += 1
+            self.max_checked_out = max(self.max_checked_out, self.checked_out)
+            self.wait_ms_total += wait_ms
+            self.wait_ms_max = max(self.wait_ms_max, wait_ms)
+            if wait_ms >= self.slow_checkout_ms:
+                self.counters["slow_checkouts"] += 1
+    
+    def connection_check_out_failed(self, event):
+        exhausted = event.reason == ConnectionCheckOutFailedReason.TIMEOUT
+        with self._lock:
+            self.counters["checkout_failures"] += 1
+            if exhausted:
+                self.counters["pool_exhausted"] += 1
+        if exhausted:
+            logging.getLogger(__name__).warning(
+                f"MongoDB connection pool to {event.address} exhausted: {self.checked_out} connections checked out"
+            )
+    
+    def connection_checked_in(self, event):
+        with self._lock:
+            self.checked_out -= 1
+    
+    def connection_created(self, event):
+        with self._lock:
+            self.counters["connections_created"] += 1
+    
+    def connection_closed(self, event):
+        with self._lock:
+            self.counters["connections_closed"] += 1
+    
+    def pool_cleared(self, event):
+        with self._lock:
+            self.counters["pool_clears"] += 1
+    
+    def connection_ready(self, event):
+        pass
+    
+    def pool_created(self, event):
+        pass
+    
+    def pool_ready(self, event):
+        pass
+    
+    def pool_closed(self, event):
+        pass
+    
+    def snapshot(self):
+        with self._lock:
+            checkouts = self.counters["checkouts"]
+            return {
+                **self.counters,
+                "open_connections": self.counters["connections_created"] - self.counters["connections_closed"],
+                "checked_out": self.checked_out,
+                "max_checked_out": self.max_checked_out,
+                "avg_wait_ms": round(self.wait_ms_total / checkouts, 3) if checkouts else 0.0,
+                "max_wait_ms": round(self.wait_ms_max, 3)
+            }
+
+# Prometheus metrics, served at /metrics. With several uvicorn workers set
+# PROMETHEUS_MULTIPROC_DIR so that /metrics aggregates every worker.
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+DB_LATENCY_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5)
+
+HTTP_REQUESTS = Counter("http_requests_total", "HTTP requests handled", ["method", "route", "status"])
+HTTP_REQUEST_SECONDS = Histogram(
+    "http_request_duration_seconds", "HTTP request latency", ["method", "route"], buckets=LATENCY_BUCKETS
+)
+HTTP_REQUESTS_IN_PROGRESS = Gauge(
+    "http_requests_in_progress", "HTTP requests being handled", ["method", "route"], multiprocess_mode="livesum"
+)
+MONGO_COMMAND_SECONDS = Histogram(
+    "mongodb_command_duration_seconds", "MongoDB command latency", ["command", "collection"], buckets=DB_LATENCY_BUCKETS
+)
+MONGO_COMMAND_FAILURES = Counter("mongodb_command_failures_total", "Failed MongoDB commands", ["command", "collection"])
+ANALYSIS_SECONDS = Histogram(
+    "analysis_duration_seconds", "Run time of CPU-heavy functions", ["function"], buckets=LATENCY_BUCKETS
+)
+
+# Per-request phase timings, sent back in the Server-Timing header
+SLOW_REQUEST_SECONDS = float(os.environ.get("SLOW_REQUEST_MS", "1000")) / 1000
+
+class RequestTiming:
+    """
+    Time one request spent in auth, MongoDB and analysis. Motor runs commands
+    in worker threads with a copy of the request's context, so the command
+    listener reports here from other threads, hence the lock.
+    """
+    __slots__ = ("phases", "db_round_trips", "_lock")
+    
+    def __init__(self):
+        self.phases = {}
+        self.db_round_trips = 0
+        self._lock = threading.Lock()
+    
+    def add(self, phase, seconds, round_trip=False):
+        with self._lock:
+            self.phases[phase] = self.phases.get(phase, 0.0) + seconds
+            if round_trip:
+                self.db_round_trips += 1
+    
+    def server_timing(self, total):
+        """
+        Server-Timing header value. Phases are exclusive of each other; db time
+        is summed over commands, which may overlap one another.
+        """
+        entries = []
+        for phase, seconds in self.phases.items():
+            entry = f"{phase};dur={seconds * 1000:.1f}"
+            if phase == "db":
+                entry += f';desc="{self.db_round_trips} round trips"'
+            entries.append(entry)
+        entries.append(f"total;dur={total * 1000:.1f}")
+        return ", ".join(entries)
+
+request_timing = contextvars.ContextVar("request_timing", default=None)
+
+def report_timing(phase, seconds, round_trip=False):
+    """Add time to a phase of the current request, if there is one"""
+    timing = request_timing.get()
+    if timing is not None:
+        timing.add(phase, seconds, round_trip)
+
+def timed_analysis(name):
+    """
+    Record the run time of a CPU-heavy function as
+    analysis_duration_seconds{function=name} and in the request's analysis phase
+    """
+    histogram = ANALYSIS_SECONDS.labels(name)
+    
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            started = time.perf_counter()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                elapsed = time.perf_counter() - started
+                histogram.observe(elapsed)
+                report_timing("analysis", elapsed)
+        return wrapper
+    return decorator
+
+class CommandMetrics(CommandListener):
+    """Times every MongoDB command by command name and collection, and per request"""
+    
+    def __init__(self):
+        self._started = {}
+    
+    def started(self, event):
+        target = event.command.get(event.command_name)
+        if event.command_name == "getMore":
+            target = event.command.get("collection")
+        collection = target if isinstance(target, str) else ""
+        self._started[(event.connection_id, event.request_id)] = collection
+    
+    def succeeded(self, event):
+        collection = self._started.pop((event.connection_id, event.request_id), "")
+        MONGO_COMMAND_SECONDS.labels(event.command_name, collection).observe(event.duration_micros / 1e6)
+        report_timing("db", event.duration_micros / 1e6, round_trip=True)
+    
+    def failed(self, event):
+        collection = self._started.pop((event.connection_id, event.request_id), "")
+        MONGO_COMMAND_SECONDS.labels(event.command_name, collection).observe(event.duration_micros / 1e6)
+        MONGO_COMMAND_FAILURES.labels(event.command_name, collection).inc()
+        report_timing("db", event.duration_micros / 1e6, round_trip=True)
+
+class PoolMetricsCollector:
+    """
+    Exposes the PoolMetrics counters of this process to Prometheus. With
+    ``pid_label``, samples are labelled with this process's pid, as the
+    multiprocess registry also holds the other workers' metrics.
+    """
+    
+    def __init__(self, pool_metrics, pid_label=False):
+        self.pool_metrics = pool_metrics
+        self.pid_label = pid_label
+    
+    def collect(self):
+        snapshot = self.pool_metrics.snapshot()
+        labels = {"pid": str(os.getpid())} if self.pid_label else {}
+        for family, names in (
+            (CounterMetricFamily, ("connections_created", "connections_closed", "checkouts", "slow_checkouts", "checkout_failures", "pool_exhausted", "pool_clears")),
+            (GaugeMetricFamily, ("open_connections", "checked_out", "max_checked_out", "avg_wait_ms", "max_wait_ms"))
+        ):
+            for name in names:
+                metric = family(f"mongodb_pool_{name}", f"MongoDB connection pool {name.replace('_', ' ')}", labels=list(labels))
+                metric.add_metric(list(labels.values()), snapshot[name])
+                yield metric
+
 mongo_url = os.environ['MONGO_URL']
-client = AsyncIOMotorClient(mongo_url)
+mongo_options = mongo_client_options()
+db_pool_metrics = PoolMetrics(slow_checkout_ms=float(os.environ.get("MONGO_SLOW_CHECKOUT_MS", "10")))
+REGISTRY.register(PoolMetricsCollector(db_pool_metrics))
+client = AsyncIOMotorClient(mongo_url, event_listeners=[db_pool_metrics, CommandMetrics()], **mongo_options)
 db = client[os.environ['DB_NAME']]
 
 # Create the main app without a prefix
@@ -38,10 +316,13 @@ api_router = APIRouter(prefix="/api")
 
 # Security
 security = HTTPBearer()
+optional_security = HTTPBearer(auto_error=False)
 JWT_SECRET = os.getenv('JWT_SECRET', 'your-secret-key-change-this')
 JWT_ALGORITHM = "HS256"
 
 # Helper functions
+PAGE_MAX_LIMIT = 200
+
 def prepare_for_mongo(data):
     """Prepare data for MongoDB storage"""
     if isinstance(data, dict):
@@ -58,6 +339,39 @@ def prepare_for_mongo(data):
         return result
     return data
 
+def encode_cursor(doc):
+    """Opaque keyset cursor pointing just past ``doc`` in (created_at, id) order"""
+    return base64.urlsafe_b64encode(json.dumps([doc["created_at"], doc["id"]]).encode()).decode()
+
+def after_key(field, value, doc_id):
+    """Query clause selecting the documents after (value, doc_id) in (field, id) order"""
+    return {"$or": [
+        {field: {"$gt": value}},
+        {field: value, "id": {"$gt": doc_id}}
+    ]}
+
+def keyset_filter(cursor):
+    """Query clause selecting the documents after an encode_cursor() cursor"""
+    try:
+        created_at, doc_id = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+    except (ValueError, TypeError):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+    return after_key("created_at", created_at, doc_id)
+
+async def fetch_page(collection, query, limit, cursor, response):
+    """
+    One page of ``query`` in (created_at, id) order. The cursor of the next page,
+    if there is one, is returned in the X-Next-Cursor header.
+    """
+    if cursor:
+        query = {"$and": [query, keyset_filter(cursor)]}
+    limit = max(1, min(limit, PAGE_MAX_LIMIT))
+    docs = await collection.find(query, {"_id": 0}).sort([("created_at", 1), ("id", 1)]).limit(limit + 1).to_list(limit + 1)
+    if len(docs) > limit:
+        docs = docs[:limit]
+        response.headers["X-Next-Cursor"] = encode_cursor(docs[-1])
+    return docs
+
 def parse_from_mongo(item):
     """Parse data from MongoDB"""
     if isinstance(item, dict):
@@ -79,6 +393,23 @@ def parse_from_mongo(item):
         return result
     return item
 
+def mongo_key(text):
+    """Escape free text for use as a MongoDB field name"""
+    return text.replace("$", "\uff04").replace(".", "\uff0e")
+
+def from_mongo_key(key):
+    """Reverse mongo_key"""
+    return key.replace("\uff04", "$").replace("\uff0e", ".")
+
+@timed_analysis("bcrypt_hash")
+def hash_password(password: str) -> str:
+    """Salted bcrypt hash of a password"""
+    return bcrypt.hashpw(password.encode('utf-8'), bcrypt.gensalt(rounds=12)).decode('utf-8')
+
+@timed_analysis("bcrypt_check")
+def check_password(password: str, hashed: str) -> bool:
+    return bcrypt.checkpw(password.encode('utf-8'), hashed.encode('utf-8'))
+
 def create_jwt_token(user_id: str) -> str:
     """Create JWT token for user authentication"""
     payload = {
@@ -89,13 +420,21 @@ def create_jwt_token(user_id: str) -> str:
 
 async def get_current_user(credentials: HTTPAuthorizationCredentials = Depends(security)):
     """Get current user from JWT token"""
+    return await user_from_token(credentials.credentials)
+
+async def user_from_token(token: str):
+    """Resolve a JWT to its user, raising 401 when it is invalid or expired"""
+    started = time.perf_counter()
+    lookup = 0.0
     try:
-        payload = jwt.decode(credentials.credentials, JWT_SECRET, algorithms=[JWT_ALGORITHM])
+        payload = jwt.decode(token, JWT_SECRET, algorithms=[JWT_ALGORITHM])
         user_id = payload.get("user_id")
         if user_id is None:
             raise HTTPException(status_code=401, detail="Invalid token")
         
+        lookup_started = time.perf_counter()
         user = await db.users.find_one({"id": user_id})
+        lookup = time.perf_counter() - lookup_started
         if user is None:
             raise HTTPException(status_code=401, detail="User not found")
         
@@ -104,6 +443,9 @@ async def get_current_user(credentials: HTTPAuthorizationCredentials = Depends(s
         raise HTTPException(status_code=401, detail="Token expired")
     except jwt.JWTError:
         raise HTTPException(status_code=401, detail="Invalid token")
+    finally:
+        # The user lookup is already reported under db, so phases do not overlap
+        report_timing("auth", time.perf_counter() - started - lookup)
 
 # Pydantic Models
 class User(BaseModel):
@@ -138,7 +480,9 @@ class Project(BaseModel):
     status: str = "active"  # active, completed, paused
     deadline: Optional[datetime] = None
     created_at: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
-    progress: int = 0  # 0-100
+    progress: int = 0  # 0-100, derived from task_counts on read
+    task_counts: Dict[str, int] = {}  # tasks per status, maintained with $inc by the task routes
+    updated_at: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
 
 class ProjectCreate(BaseModel):
     title: str
@@ -151,11 +495,13 @@ class Task(BaseModel):
     title: str
     description: str = ""
     project_id: str
+    user_id: str = ""  # owner of the project, denormalized for single-query ownership checks
     assigned_to: str = ""
     status: str = "todo"  # todo, in_progress, completed
     priority: str = "medium"  # low, medium, high
     due_date: Optional[datetime] = None
     created_at: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
+    updated_at: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
 
 class TaskCreate(BaseModel):
     title: str
@@ -164,32 +510,61 @@ class TaskCreate(BaseModel):
     priority: str = "medium"
     due_date: Optional[datetime] = None
 
+class TaskOperation(BaseModel):
+    op: str  # create, update, delete
+    task_id: Optional[str] = None
+    data: Dict[str, Any] = {}
+
+class TaskBulkRequest(BaseModel):
+    operations: List[TaskOperation]
+    ordered: bool = True
+
 class QuizSession(BaseModel):
     id: str = Field(default_factory=lambda: str(uuid.uuid4()))
     user_id: str
     category: str  # aptitude, coding, technical
     score: int = 0
     total_questions: int = 0
+    question_ids: List[str] = []  # questions drawn for this session
     completed: bool = False
     created_at: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
 
+class QuizSessionStart(QuizSession):
+    questions: List[Dict[str, Any]] = []
+
 class QuizAnswer(BaseModel):
     session_id: str
     question_id: str
     selected_answer: str
-    is_correct: bool
+    is_correct: bool = False  # ignored; the server grades against the question bank
+
+class QuizAnswerItem(BaseModel):
+    question_id: str
+    selected_answer: str
+
+class CodeSubmission(BaseModel):
+    code: str
+
+class QuizAnswerBatch(BaseModel):
+    session_id: str
+    answers: List[QuizAnswerItem]
 
 class InterviewSession(BaseModel):
     id: str = Field(default_factory=lambda: str(uuid.uuid4()))
     user_id: str
     type: str  # hr, technical
     questions: List[Dict[str, Any]] = []
-    responses: List[Dict[str, Any]] = []
+    responses: List[Dict[str, Any]] = []  # legacy; responses now live in interview_responses
+    aggregates: Dict[str, Any] = {}  # running totals maintained on each response
+    answered_question_ids: List[str] = []  # each question is answered at most once
     feedback: str = ""
     score: int = 0
     completed: bool = False
     created_at: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
 
+class InterviewResponseBatch(BaseModel):
+    responses: List[Dict[str, Any]]  # each with question_id, question, answer
+
 # Sample data for questions
 APTITUDE_QUESTIONS = [
     {
@@ -221,17 +596,86 @@ CODING_QUESTIONS = [
         "question": "Write a function to reverse a string in Python",
         "language": "python",
         "difficulty": "easy",
-        "sample_answer": "def reverse_string(s):\n    return s[::-1]"
+        "sample_answer": "def reverse_string(s):\n    return s[::-1]",
+        "function": "reverse_string",
+        "test_cases": [
+            {"args": ["hello"], "expected": "olleh"},
+            {"args": [""], "expected": ""},
+            {"args": ["a"], "expected": "a"},
+            {"args": ["racecar"], "expected": "racecar"},
+            {"args": ["Hello, World!"], "expected": "!dlroW ,olleH"}
+        ]
     },
     {
         "id": "code_2",
         "question": "Implement binary search algorithm",
         "language": "python",
         "difficulty": "medium",
-        "sample_answer": "def binary_search(arr, target):\n    left, right = 0, len(arr) - 1\n    while left <= right:\n        mid = (left + right) // 2\n        if arr[mid] == target:\n            return mid\n        elif arr[mid] < target:\n            left = mid + 1\n        else:\n            right = mid - 1\n    return -1"
+        "sample_answer": "def binary_search(arr, target):\n    left, right = 0, len(arr) - 1\n    while left <= right:\n        mid = (left + right) // 2\n        if arr[mid] == target:\n            return mid\n        elif arr[mid] < target:\n            left = mid + 1\n        else:\n            right = mid - 1\n    return -1",
+        "function": "binary_search",
+        "test_cases": [
+            {"args": [[1, 3, 5, 7, 9], 7], "expected": 3},
+            {"args": [[1, 3, 5, 7, 9], 1], "expected": 0},
+            {"args": [[1, 3, 5, 7, 9], 9], "expected": 4},
+            {"args": [[1, 3, 5, 7, 9], 4], "expected": -1},
+            {"args": [[], 1], "expected": -1},
+            {"args": [list(range(0, 2000, 2)), 1998], "expected": 999}
+        ]
     }
 ]
 
+class QuestionBank:
+    """
+    In-memory question store indexed by category, sub-category, difficulty and language.
+    
+    Every question is filed under each combination of its index values and the
+    wildcard None, so any filter maps to one precomputed id array and drawing k
+    random questions is O(k) with random.sample, whatever the bank size.
+    """
+    
+    def __init__(self):
+        self.by_id = {}
+        self.categories = {}
+        self._buckets = {}
+    
+    def add(self, question, category):
+        # aptitude questions carry their quantitative/logical/verbal split in "category"
+        sub_category = question.get("sub_category") or (question.get("category") if category == "aptitude" else None)
+        indexed = {**question, "sub_category": sub_category, "difficulty": question.get("difficulty", "medium")}
+        self.by_id[indexed["id"]] = indexed
+        self.categories[indexed["id"]] = category
+        values = [(category, None), (sub_category, None), (indexed["difficulty"], None), (question.get("language"), None)]
+        for key in set(product(*values)):
+            self._buckets.setdefault(key, []).append(indexed["id"])
+    
+    def get(self, question_id):
+        return self.by_id.get(question_id)
+    
+    def count(self, category, sub_category=None, difficulty=None, language=None):
+        return len(self._buckets.get((category, sub_category, difficulty, language), []))
+    
+    def sample(self, k, category, sub_category=None, difficulty=None, language=None):
+        """Up to k random questions matching the filters; the whole bucket, in bank order, if it has k or fewer"""
+        bucket = self._buckets.get((category, sub_category, difficulty, language), [])
+        ids = bucket if k >= len(bucket) else random.sample(bucket, k)
+        return [self.by_id[question_id] for question_id in ids]
+    
+    @staticmethod
+    def public(question):
+        """Question as shown during a graded session, without answers or hidden tests"""
+        return {
+            key: value for key, value in question.items()
+            if key not in ("correct_answer", "sample_answer", "test_cases")
+        }
+
+QUESTION_BANK = QuestionBank()
+for _question in APTITUDE_QUESTIONS:
+    QUESTION_BANK.add(_question, "aptitude")
+for _question in CODING_QUESTIONS:
+    QUESTION_BANK.add(_question, "coding")
+
+QUIZ_CATEGORIES = ("aptitude", "coding")
+
 INTERVIEW_QUESTIONS = {
     "hr": [
         "Tell me about yourself",
@@ -566,8 +1010,7 @@ async def register_user(user_data: UserCreate):
         raise HTTPException(status_code=400, detail="Email already registered")
     
     # Hash password with salt
-    salt = bcrypt.gensalt(rounds=12)
-    hashed_password = bcrypt.hashpw(user_data.password.encode('utf-8'), salt)
+    hashed_password = hash_password(user_data.password)
     
     # Create user
     user = User(
@@ -579,7 +1022,7 @@ async def register_user(user_data: UserCreate):
     )
     
     user_dict = prepare_for_mongo(user.dict())
-    user_dict["password"] = hashed_password.decode('utf-8')
+    user_dict["password"] = hashed_password
     user_dict["created_at"] = datetime.now(timezone.utc).isoformat()
     user_dict["email_verified"] = False
     user_dict["login_attempts"] = 0
@@ -613,7 +1056,7 @@ async def login_user(login_data: UserLogin):
         raise HTTPException(status_code=429, detail="Too many failed login attempts. Please try again later.")
     
     # Check password
-    if not bcrypt.checkpw(login_data.password.encode('utf-8'), user["password"].encode('utf-8')):
+    if not check_password(login_data.password, user["password"]):
         # Increment failed login attempts
         await db.users.update_one({"email": email}, {"$inc": {"login_attempts": 1}})
         raise HTTPException(status_code=401, detail="Invalid credentials")
@@ -636,6 +1079,169 @@ async def login_user(login_data: UserLogin):
 async def get_current_user_info(current_user: dict = Depends(get_current_user)):
     return current_user
 
+# Project Board Events
+PROJECT_EVENT_BUFFER = int(os.environ.get("PROJECT_EVENT_BUFFER", "256"))
+PROJECT_EVENT_MAX_SUBSCRIBERS = int(os.environ.get("PROJECT_EVENT_MAX_SUBSCRIBERS", "1000"))
+# Subscribers served per event loop turn; a fan-out yields to other requests between chunks
+PROJECT_EVENT_FANOUT_CHUNK = 64
+SSE_HEARTBEAT_SECONDS = 15
+SSE_RESYNC_FRAME = b"event: resync\ndata: {}\n\n"
+
+class EventSubscription:
+    """One SSE client's bounded buffer of encoded event frames"""
+    __slots__ = ("frames", "limit", "ready", "lagged")
+
+    def __init__(self, limit):
+        self.frames = deque()
+        self.limit = limit
+        self.ready = asyncio.Event()
+        self.lagged = False
+
+    def push(self, frame):
+        """Buffer a frame; returns False when the buffer overflowed"""
+        if self.lagged:
+            return True
+        self.ready.set()
+        if len(self.frames) >= self.limit:
+            # A client this far behind reloads the board instead of replaying the backlog
+            self.frames.clear()
+            self.lagged = True
+            return False
+        self.frames.append(frame)
+        return True
+
+    async def next(self, timeout):
+        """The frames buffered so far, waiting up to ``timeout`` for one; [] on timeout"""
+        if not self.ready.is_set():
+            # A timer rather than wait_for: no task per wait, and a cancelled
+            # stream cannot have its cancellation swallowed by a racing event
+            timer = asyncio.get_running_loop().call_later(timeout, self.ready.set)
+            try:
+                await self.ready.wait()
+            finally:
+                timer.cancel()
+        self.ready.clear()
+        if self.lagged:
+            self.lagged = False
+            return [SSE_RESYNC_FRAME]
+        frames = list(self.frames)
+        self.frames.clear()
+        return frames
+
+class ProjectEventHub:
+    """
+    In-process pub/sub of project board changes, feeding the SSE stream.
+
+    ``publish`` encodes an event once and queues it; a background task appends
+    the same bytes to every subscriber's buffer, PROJECT_EVENT_FANOUT_CHUNK
+    subscribers per loop turn, so a write path neither waits on slow clients
+    nor stalls the loop for busy boards. Events are fanned out in publish order.
+    A subscriber whose buffer fills up is sent a ``resync`` event instead. Each
+    server process has its own hub and sees only the writes it handles itself.
+    """
+
+    def __init__(self, buffer_size=PROJECT_EVENT_BUFFER, fanout_chunk=PROJECT_EVENT_FANOUT_CHUNK):
+        self.buffer_size = buffer_size
+        self.fanout_chunk = fanout_chunk
+        self._subscribers = {}
+        self._sequence = 0
+        self._pending = deque()
+        self._fanout_task = None
+        self.stats = {"published": 0, "delivered": 0, "overflows": 0}
+
+    def subscriber_count(self, project_id):
+        return len(self._subscribers.get(project_id, ()))
+
+    def subscribe(self, project_id):
+        subscription = EventSubscription(self.buffer_size)
+        self._subscribers.setdefault(project_id, set()).add(subscription)
+        return subscription
+
+    def unsubscribe(self, project_id, subscription):
+        subscribers = self._subscribers.get(project_id)
+        if subscribers is not None:
+            subscribers.discard(subscription)
+            if not subscribers:
+                del self._subscribers[project_id]
+
+    def publish(self, project_id, event, data):
+        """Queue an event for the project's subscribers; returns how many there are now"""
+        subscribers = self._subscribers.get(project_id)
+        if not subscribers:
+            return 0
+        self._sequence += 1
+        frame = f"id: {self._sequence}\nevent: {event}\ndata: {json.dumps(data, default=str)}\n\n".encode()
+        self._pending.append((project_id, frame))
+        if self._fanout_task is None or self._fanout_task.done():
+            self._fanout_task = asyncio.get_running_loop().create_task(self._fan_out())
+        self.stats["published"] += 1
+        return len(subscribers)
+
+    async def _fan_out(self):
+        while self._pending:
+            project_id, frame = self._pending.popleft()
+            subscribers = list(self._subscribers.get(project_id, ()))
+            for start in range(0, len(subscribers), self.fanout_chunk):
+                if start:
+                    await asyncio.sleep(0)
+                for subscription in subscribers[start:start + self.fanout_chunk]:
+                    if not subscription.push(frame):
+                        self.stats["overflows"] += 1
+            self.stats["delivered"] += len(subscribers)
+
+    async def flush(self):
+        """Wait until every published event has been fanned out"""
+        while self._fanout_task is not None and not self._fanout_task.done():
+            await asyncio.shield(self._fanout_task)
+
+    def snapshot(self):
+        return {
+            **self.stats,
+            "queued": len(self._pending),
+            "projects": len(self._subscribers),
+            "subscribers": sum(len(subscribers) for subscribers in self._subscribers.values())
+        }
+
+project_events = ProjectEventHub()
+
+@api_router.get("/projects/{project_id}/events")
+async def stream_project_events(
+    project_id: str,
+    token: Optional[str] = None,
+    credentials: Optional[HTTPAuthorizationCredentials] = Depends(optional_security)
+):
+    """
+    Server-Sent Events stream of a project's task changes: task_created,
+    task_updated, tasks_changed (bulk operations) and project_updated. A
+    ``resync`` event means events were dropped and the board should be
+    reloaded. Browsers' EventSource cannot set headers, so the JWT may also
+    be passed as the ``token`` query parameter.
+    """
+    if credentials is None and token is None:
+        raise HTTPException(status_code=401, detail="Not authenticated")
+    current_user = await user_from_token(credentials.credentials if credentials else token)
+    project = await db.projects.find_one({"id": project_id, "user_id": current_user["id"]}, {"_id": 1})
+    if not project:
+        raise HTTPException(status_code=404, detail="Project not found")
+    if project_events.subscriber_count(project_id) >= PROJECT_EVENT_MAX_SUBSCRIBERS:
+        raise HTTPException(status_code=503, detail="Too many open event streams for this project")
+    
+    async def frames():
+        subscription = project_events.subscribe(project_id)
+        try:
+            yield b"retry: 3000\n\n"
+            while True:
+                batch = await subscription.next(SSE_HEARTBEAT_SECONDS)
+                yield b"".join(batch) if batch else b": ping\n\n"
+        finally:
+            project_events.unsubscribe(project_id, subscription)
+    
+    return StreamingResponse(
+        frames(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
 # Project Management Routes
 @api_router.post("/projects", response_model=Project)
 async def create_project(project_data: ProjectCreate, current_user: dict = Depends(get_current_user)):
@@ -649,13 +1255,21 @@ async def create_project(project_data: ProjectCreate, current_user: dict = Depen
     
     project_dict = prepare_for_mongo(project.dict())
     await db.projects.insert_one(project_dict)
+    # A new project changes which projects, and so which tasks, are recent
+    await refresh_dashboard_projects(current_user["id"])
     
     return project
 
 @api_router.get("/projects", response_model=List[Project])
-async def get_user_projects(current_user: dict = Depends(get_current_user)):
-    projects = await db.projects.find({"user_id": current_user["id"]}).to_list(100)
-    return [Project(**parse_from_mongo(project)) for project in projects]
+async def get_user_projects(
+    response: Response,
+    limit: int = 100,
+    cursor: Optional[str] = None,
+    current_user: dict = Depends(get_current_user)
+):
+    """The user's projects, oldest first, one page at a time"""
+    projects = await fetch_page(db.projects, {"user_id": current_user["id"]}, limit, cursor, response)
+    return [Project(**with_progress(parse_from_mongo(project))) for project in projects]
 
 @api_router.get("/projects/{project_id}", response_model=Project)
 async def get_project(project_id: str, current_user: dict = Depends(get_current_user)):
@@ -663,25 +1277,102 @@ async def get_project(project_id: str, current_user: dict = Depends(get_current_
     if not project:
         raise HTTPException(status_code=404, detail="Project not found")
     
-    return Project(**parse_from_mongo(project))
+    return Project(**with_progress(parse_from_mongo(project)))
 
 @api_router.put("/projects/{project_id}", response_model=Project)
 async def update_project(project_id: str, project_data: ProjectCreate, current_user: dict = Depends(get_current_user)):
-    project = await db.projects.find_one({"id": project_id, "user_id": current_user["id"]})
-    if not project:
-        raise HTTPException(status_code=404, detail="Project not found")
-    
+    # Ownership check, update and read-back in one round trip
     update_data = prepare_for_mongo(project_data.dict(exclude_unset=True))
-    await db.projects.update_one({"id": project_id}, {"$set": update_data})
+    update_data["updated_at"] = datetime.now(timezone.utc).isoformat()
+    updated_project = await db.projects.find_one_and_update(
+        {"id": project_id, "user_id": current_user["id"]},
+        {"$set": update_data},
+        projection={"_id": 0},
+        return_document=ReturnDocument.AFTER
+    )
+    if not updated_project:
+        raise HTTPException(status_code=404, detail="Project not found")
     
-    updated_project = await db.projects.find_one({"id": project_id})
-    return Project(**parse_from_mongo(updated_project))
+    await db.dashboard_views.update_one(
+        {"user_id": current_user["id"], "recent_projects.id": project_id},
+        {"$set": {"recent_projects.$": updated_project}}
+    )
+    project_events.publish(project_id, "project_updated", with_progress(dict(updated_project)))
+    return Project(**with_progress(parse_from_mongo(updated_project)))
 
 # Task Management Routes
+TASK_IMMUTABLE_FIELDS = ("_id", "id", "project_id", "user_id", "created_at", "updated_at")
+TASK_STATUSES = ("todo", "in_progress", "completed")
+
+def validate_task_status(update_data):
+    if "status" in update_data and update_data["status"] not in TASK_STATUSES:
+        raise HTTPException(status_code=400, detail=f"status must be one of {', '.join(TASK_STATUSES)}")
+
+def utc_isoformat(value):
+    """
+    ISO string of a datetime or ISO string in UTC, naive values taken as UTC.
+    Due dates are stored and queried in this one form so that they compare
+    as strings in time order.
+    """
+    if isinstance(value, str):
+        value = datetime.fromisoformat(value.replace("Z", "+00:00"))
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    return value.astimezone(timezone.utc).isoformat()
+
+def normalize_due_date(task_data):
+    if task_data.get("due_date") is not None:
+        try:
+            task_data["due_date"] = utc_isoformat(task_data["due_date"])
+        except (ValueError, TypeError):
+            raise HTTPException(status_code=400, detail="due_date must be an ISO 8601 datetime")
+
+def with_progress(project):
+    """Fill in a project's progress from its task status counters"""
+    counts = project.get("task_counts") or {}
+    total = sum(counts.values())
+    project["progress"] = round(100 * counts.get("completed", 0) / total) if total else 0
+    return project
+
+async def recount_project_tasks(project_ids):
+    """Recompute the task_counts of the given projects from the tasks collection"""
+    counts = {project_id: {} for project_id in project_ids}
+    if not counts:
+        return counts
+    pipeline = [
+        {"$match": {"project_id": {"$in": list(counts)}}},
+        {"$group": {"_id": {"project_id": "$project_id", "status": "$status"}, "count": {"$sum": 1}}}
+    ]
+    async for group in db.tasks.aggregate(pipeline):
+        counts[group["_id"]["project_id"]][group["_id"]["status"]] = group["count"]
+    await db.projects.bulk_write(
+        [
+            UpdateOne({"id": project_id}, {"$set": {"task_counts": task_counts, "updated_at": datetime.now(timezone.utc).isoformat()}})
+            for project_id, task_counts in counts.items()
+        ],
+        ordered=False
+    )
+    return counts
+
+async def backfill_project_task_counts():
+    """Give projects created before task counters their counts, so later $inc start from the truth"""
+    project_ids = [p["id"] async for p in db.projects.find({"task_counts": None}, {"_id": 0, "id": 1})]
+    await recount_project_tasks(project_ids)
+
+async def backfill_task_owners():
+    """Copy the project owner onto tasks created before tasks carried user_id"""
+    await db.tasks.aggregate([
+        {"$match": {"user_id": None}},
+        {"$lookup": {"from": "projects", "localField": "project_id", "foreignField": "id", "as": "project"}},
+        {"$set": {"user_id": {"$ifNull": [{"$first": "$project.user_id"}, ""]}}},
+        {"$project": {"project": 0}},
+        {"$merge": {"into": "tasks", "on": "_id", "whenMatched": "merge", "whenNotMatched": "discard"}}
+    ]).to_list(None)
+
 @api_router.post("/projects/{project_id}/tasks", response_model=Task)
 async def create_task(project_id: str, task_data: TaskCreate, current_user: dict = Depends(get_current_user)):
     # Verify project ownership
-    project = await db.projects.find_one({"id": project_id, "user_id": current_user["id"]})
+    project = await db.projects.find_one({"id": project_id, "user_id": current_user["id"]}, {"_id": 1})
     if not project:
         raise HTTPException(status_code=404, detail="Project not found")
     
@@ -689,86 +1380,1746 @@ async def create_task(project_id: str, task_data: TaskCreate, current_user: dict
         title=task_data.title,
         description=task_data.description,
         project_id=project_id,
+        user_id=current_user["id"],
         assigned_to=task_data.assigned_to,
         priority=task_data.priority,
         due_date=task_data.due_date
     )
     
     task_dict = prepare_for_mongo(task.dict())
+    normalize_due_date(task_dict)
+    view_task = dict(task_dict)
     await db.tasks.insert_one(task_dict)
+    count_path = f"task_counts.{task.status}"
+    await asyncio.gather(
+        db.projects.update_one(
+            {"id": project_id},
+            {"$inc": {count_path: 1}, "$set": {"updated_at": task_dict["updated_at"]}}
+        ),
+        db.dashboard_views.update_one(
+            {"user_id": current_user["id"], "recent_projects.id": project_id},
+            {
+                "$push": {"recent_tasks": {"$each": [view_task], "$sort": {"created_at": -1}, "$slice": DASHBOARD_RECENT_TASKS}},
+                "$inc": {f"recent_projects.$.{count_path}": 1}
+            }
+        )
+    )
+    project_events.publish(project_id, "task_created", view_task)
+    task_reminders.track(view_task)
     
     return task
 
 @api_router.get("/projects/{project_id}/tasks", response_model=List[Task])
-async def get_project_tasks(project_id: str, current_user: dict = Depends(get_current_user)):
+async def get_project_tasks(
+    project_id: str,
+    response: Response,
+    status: Optional[str] = None,
+    priority: Optional[str] = None,
+    assigned_to: Optional[str] = None,
+    due_after: Optional[datetime] = None,
+    due_before: Optional[datetime] = None,
+    limit: int = 100,
+    cursor: Optional[str] = None,
+    current_user: dict = Depends(get_current_user)
+):
+    """
+    A project's tasks, oldest first, one page at a time, optionally filtered.
+    Equality filters page straight off an index; a due-date range is sorted in
+    memory, so each of its pages costs in proportion to the tasks in the range.
+    """
     # Verify project ownership
-    project = await db.projects.find_one({"id": project_id, "user_id": current_user["id"]})
+    project = await db.projects.find_one({"id": project_id, "user_id": current_user["id"]}, {"_id": 1})
     if not project:
         raise HTTPException(status_code=404, detail="Project not found")
     
-    tasks = await db.tasks.find({"project_id": project_id}).to_list(100)
+    query = {"project_id": project_id}
+    for field, value in (("status", status), ("priority", priority), ("assigned_to", assigned_to)):
+        if value is not None:
+            query[field] = value
+    if due_after or due_before:
+        # Due dates are stored as UTC ISO strings, which compare in time order
+        query["due_date"] = {}
+        if due_after:
+            query["due_date"]["$gte"] = utc_isoformat(due_after)
+        if due_before:
+            query["due_date"]["$lte"] = utc_isoformat(due_before)
+    
+    tasks = await fetch_page(db.tasks, query, limit, cursor, response)
     return [Task(**parse_from_mongo(task)) for task in tasks]
 
 @api_router.put("/tasks/{task_id}", response_model=Task)
 async def update_task(task_id: str, task_data: dict, current_user: dict = Depends(get_current_user)):
-    task = await db.tasks.find_one({"id": task_id})
+    # Identity and ownership fields cannot be changed through an update
+    update_data = prepare_for_mongo({
+        key: value for key, value in task_data.items() if key not in TASK_IMMUTABLE_FIELDS
+    })
+    validate_task_status(update_data)
+    normalize_due_date(update_data)
+    update_data["updated_at"] = datetime.now(timezone.utc).isoformat()
+    
+    # The ownership predicate sits in the filter, so this is the only round trip on success.
+    # The pre-image tells which status counter to move; $set makes the post-image a merge.
+    task = await db.tasks.find_one_and_update(
+        {"id": task_id, "user_id": current_user["id"]},
+        {"$set": update_data},
+        projection={"_id": 0},
+        return_document=ReturnDocument.BEFORE
+    )
     if not task:
-        raise HTTPException(status_code=404, detail="Task not found")
+        exists = await db.tasks.find_one({"id": task_id}, {"_id": 1})
+        if not exists:
+            raise HTTPException(status_code=404, detail="Task not found")
+        raise HTTPException(status_code=403, detail="Access denied")
+    updated_task = {**task, **update_data}
+    
+    writes = [db.dashboard_views.update_one(
+        {"user_id": current_user["id"], "recent_tasks.id": task_id},
+        {"$set": {"recent_tasks.$": updated_task}}
+    )]
+    if updated_task["status"] != task["status"]:
+        counts = {f"task_counts.{task['status']}": -1, f"task_counts.{updated_task['status']}": 1}
+        writes.append(db.projects.update_one(
+            {"id": task["project_id"]},
+            {"$inc": counts, "$set": {"updated_at": update_data["updated_at"]}}
+        ))
+        writes.append(db.dashboard_views.update_one(
+            {"user_id": current_user["id"], "recent_projects.id": task["project_id"]},
+            {"$inc": {f"recent_projects.$.{path}": inc for path, inc in counts.items()}}
+        ))
+    await asyncio.gather(*writes)
+    project_events.publish(task["project_id"], "task_updated", updated_task)
+    task_reminders.track(updated_task)
+    return Task(**parse_from_mongo(updated_task))
+
+TASK_BULK_MAX_OPERATIONS = 500
+
+@api_router.post("/projects/{project_id}/tasks/bulk")
+async def bulk_task_operations(project_id: str, bulk: TaskBulkRequest, current_user: dict = Depends(get_current_user)):
+    """
+    Create, update and delete tasks of one project in a single bulk_write.
+    With ``ordered``, the first failing operation stops the rest.
+    """
+    if not bulk.operations:
+        raise HTTPException(status_code=400, detail="No operations provided")
+    if len(bulk.operations) > TASK_BULK_MAX_OPERATIONS:
+        raise HTTPException(status_code=400, detail=f"At most {TASK_BULK_MAX_OPERATIONS} operations per request")
     
-    # Verify project ownership
-    project = await db.projects.find_one({"id": task["project_id"], "user_id": current_user["id"]})
+    # Verify project ownership once for the whole batch
+    project = await db.projects.find_one({"id": project_id, "user_id": current_user["id"]}, {"_id": 1})
     if not project:
-        raise HTTPException(status_code=403, detail="Access denied")
+        raise HTTPException(status_code=404, detail="Project not found")
     
-    update_data = prepare_for_mongo(task_data)
-    await db.tasks.update_one({"id": task_id}, {"$set": update_data})
+    # Which referenced tasks exist, so updates and deletes of unknown ids report not_found,
+    # and their statuses, so the project's task counters can be moved by the operations
+    referenced = [operation.task_id for operation in bulk.operations if operation.op in ("update", "delete")]
+    existing = {}
+    if referenced:
+        async for task in db.tasks.find({"id": {"$in": referenced}, "project_id": project_id}, {"_id": 0, "id": 1, "status": 1}):
+            existing[task["id"]] = task["status"]
+    
+    requests = []
+    results = []
+    created = {}
+    rescheduled = set()
+    referenced_once = set()
+    updates = {}
+    new_statuses = {}
+    owned = {"project_id": project_id, "user_id": current_user["id"]}
+    now = datetime.now(timezone.utc).isoformat()
+    for index, operation in enumerate(bulk.operations):
+        if operation.op == "create":
+            try:
+                task_data = TaskCreate(**operation.data)
+            except ValueError as e:
+                raise HTTPException(status_code=400, detail=f"Operation {index}: {e}")
+            task = Task(**task_data.dict(), project_id=project_id, user_id=current_user["id"])
+            created[index] = prepare_for_mongo(task.dict())
+            normalize_due_date(created[index])
+            requests.append(InsertOne(dict(created[index])))
+            results.append({"index": index, "op": "create", "task_id": task.id, "status": "created"})
+        elif operation.op in ("update", "delete"):
+            if not operation.task_id:
+                raise HTTPException(status_code=400, detail=f"Operation {index}: task_id is required")
+            # Per-operation outcomes are derived from batch counts, which cannot tell repeats apart
+            if operation.task_id in referenced_once:
+                raise HTTPException(status_code=400, detail=f"Operation {index}: task {operation.task_id} appears more than once")
+            referenced_once.add(operation.task_id)
+            if operation.op == "update":
+                update_data = prepare_for_mongo({
+                    key: value for key, value in operation.data.items() if key not in TASK_IMMUTABLE_FIELDS
+                })
+                validate_task_status(update_data)
+                normalize_due_date(update_data)
+                if "due_date" in update_data or "status" in update_data:
+                    rescheduled.add(operation.task_id)
+                if "status" in update_data:
+                    new_statuses[index] = update_data["status"]
+                update_data["updated_at"] = now
+                updates[index] = update_data
+            # Status changes and deletes only match the status read above, so the
+            # counter moves taken from it hold unless a concurrent write got in between
+            task_filter = {"id": operation.task_id, **owned}
+            if operation.task_id in existing and (operation.op == "delete" or index in new_statuses):
+                task_filter["status"] = existing[operation.task_id]
+            if operation.op == "update":
+                requests.append(UpdateOne(task_filter, {"$set": updates[index]}))
+            else:
+                requests.append(DeleteOne(task_filter))
+            status = ("updated" if operation.op == "update" else "deleted") if operation.task_id in existing else "not_found"
+            results.append({"index": index, "op": operation.op, "task_id": operation.task_id, "status": status})
+        else:
+            raise HTTPException(status_code=400, detail=f"Operation {index}: unknown op {operation.op!r}")
     
-    updated_task = await db.tasks.find_one({"id": task_id})
-    return Task(**parse_from_mongo(updated_task))
+    try:
+        outcome = await db.tasks.bulk_write(requests, ordered=bulk.ordered)
+        details = {
+            "nInserted": outcome.inserted_count,
+            "nMatched": outcome.matched_count,
+            "nModified": outcome.modified_count,
+            "nRemoved": outcome.deleted_count
+        }
+    except BulkWriteError as e:
+        details = e.details
+        failed = {error["index"]: error.get("errmsg", "write failed") for error in details.get("writeErrors", [])}
+        first_failure = min(failed, default=len(results))
+        for result in results:
+            if result["index"] in failed:
+                result.update({"status": "failed", "error": failed[result["index"]]})
+            elif bulk.ordered and result["index"] > first_failure:
+                result["status"] = "skipped"
+    counts = {
+        "inserted": details.get("nInserted", 0),
+        "modified": details.get("nModified", 0),
+        "deleted": details.get("nRemoved", 0)
+    }
+    
+    # The pre-read only holds while the write counts agree with it. Otherwise a
+    # concurrent request deleted a task, or changed the status of one, in between:
+    # updates of deleted tasks report not_found, operations that missed a changed
+    # status are applied again without the status filter, and the counters are
+    # recounted instead of moved.
+    updated = [result for result in results if result["status"] == "updated"]
+    deleted = [result for result in results if result["status"] == "deleted"]
+    recount = len(updated) != details.get("nMatched", 0) or len(deleted) != details.get("nRemoved", 0)
+    if recount:
+        current = {}
+        async for task in db.tasks.find({"id": {"$in": [result["task_id"] for result in updated + deleted]}, **owned}, {"_id": 0, "id": 1, "status": 1}):
+            current[task["id"]] = task["status"]
+        retries = []
+        for result in updated:
+            if result["task_id"] not in current:
+                result["status"] = "not_found"
+            elif result["index"] in new_statuses and current[result["task_id"]] != new_statuses[result["index"]]:
+                retries.append(UpdateOne({"id": result["task_id"], **owned}, {"$set": updates[result["index"]]}))
+        for result in deleted:
+            if result["task_id"] in current:
+                retries.append(DeleteOne({"id": result["task_id"], **owned}))
+        if retries:
+            await db.tasks.bulk_write(retries, ordered=False)
+    
+    # Deleted tasks leave tombstones so syncing clients learn about them. Tombstones
+    # are unique per task, so of concurrent deletes of one task only one reports it.
+    if deleted:
+        try:
+            await db.tombstones.insert_many(
+                [
+                    {
+                        "id": result["task_id"],
+                        "kind": "task",
+                        "user_id": current_user["id"],
+                        "project_id": project_id,
+                        "updated_at": now,
+                        "deleted_at": datetime.now(timezone.utc)
+                    }
+                    for result in deleted
+                ],
+                ordered=False
+            )
+        except BulkWriteError as e:
+            for error in e.details.get("writeErrors", []):
+                if error["code"] != 11000:
+                    raise
+                deleted[error["index"]]["status"] = "not_found"
+    
+    for result in results:
+        if result["status"] == "created":
+            task_reminders.track(created[result["index"]])
+        elif result["status"] == "deleted":
+            task_reminders.forget(result["task_id"])
+    if rescheduled:
+        async for task in db.tasks.find({"id": {"$in": list(rescheduled)}, **owned}, {"_id": 0}):
+            task_reminders.track(task)
+    
+    # Move the status counters by what each applied operation changed
+    moves = []
+    for result in results:
+        if result["status"] == "created":
+            moves.append((created[result["index"]]["status"], 1))
+        elif result["status"] == "deleted":
+            moves.append((existing[result["task_id"]], -1))
+        elif result["status"] == "updated" and result["index"] in new_statuses:
+            moves += [(existing[result["task_id"]], -1), (new_statuses[result["index"]], 1)]
+    task_counts = {}
+    for status, inc in moves:
+        task_counts[f"task_counts.{status}"] = task_counts.get(f"task_counts.{status}", 0) + inc
+    task_counts = {path: inc for path, inc in task_counts.items() if inc}
+    if recount:
+        await recount_project_tasks([project_id])
+    elif task_counts:
+        await db.projects.update_one({"id": project_id}, {"$inc": task_counts, "$set": {"updated_at": now}})
+    # The dashboard's recent tasks may have changed in any way, refresh them with the counts
+    await refresh_dashboard_projects(current_user["id"])
+    project_events.publish(project_id, "tasks_changed", {**counts, "results": results})
+    
+    return {**counts, "results": results}
+
+# Delta Sync
+SYNC_COLLECTIONS = ("projects", "tasks", "tombstones")
+SYNC_MAX_CHANGES = 500
+# Writes stamped within this window may still be in flight, so they wait for the next sync
+SYNC_SETTLE = timedelta(seconds=2)
+TOMBSTONE_RETENTION = timedelta(days=30)
+
+def encode_watermark(watermark):
+    return base64.urlsafe_b64encode(json.dumps(watermark).encode()).decode()
+
+def decode_watermark(since):
+    """
+    Parse a sync watermark: the time it was issued as "at", and for each
+    collection read so far the [updated_at, id] key of its last change
+    """
+    try:
+        watermark = json.loads(base64.urlsafe_b64decode(since.encode()))
+        if not isinstance(watermark, dict) or not isinstance(watermark.get("at"), str):
+            raise ValueError(since)
+        for name, key in watermark.items():
+            if name == "at":
+                continue
+            if name not in SYNC_COLLECTIONS or not isinstance(key, list) or len(key) != 2 or not all(isinstance(part, str) for part in key):
+                raise ValueError(since)
+    except (ValueError, TypeError):
+        raise HTTPException(status_code=400, detail="Invalid watermark")
+    return watermark
+
+@api_router.get("/sync")
+async def sync_changes(since: Optional[str] = None, limit: int = SYNC_MAX_CHANGES, current_user: dict = Depends(get_current_user)):
+    """
+    Projects and tasks changed, and ids deleted, since the watermark of the
+    previous sync. Each collection is read in (updated_at, id) order from where
+    the watermark left it; ``has_more`` means the client should call again
+    with the new watermark. ``reset`` means the old watermark predates the
+    tombstone retention, so the client must replace its local copy.
+    """
+    now = datetime.now(timezone.utc)
+    watermark = decode_watermark(since) if since else {}
+    reset = bool(watermark) and watermark["at"] < (now - TOMBSTONE_RETENTION).isoformat()
+    if reset:
+        watermark = {}
+    settled = (now - SYNC_SETTLE).isoformat()
+    limit = max(1, min(limit, SYNC_MAX_CHANGES))
+    
+    async def changes(name):
+        query = {"user_id": current_user["id"], "updated_at": {"$lte": settled}}
+        if name in watermark:
+            query = {"$and": [query, after_key("updated_at", *watermark[name])]}
+        cursor = db[name].find(query, {"_id": 0, "deleted_at": 0}).sort([("updated_at", 1), ("id", 1)])
+        return await cursor.limit(limit + 1).to_list(limit + 1)
+    
+    results = dict(zip(SYNC_COLLECTIONS, await asyncio.gather(*(changes(name) for name in SYNC_COLLECTIONS))))
+    
+    has_more = False
+    next_watermark = dict(watermark)
+    for name, docs in results.items():
+        if len(docs) > limit:
+            del docs[limit:]
+            has_more = True
+        if docs:
+            next_watermark[name] = [docs[-1]["updated_at"], docs[-1]["id"]]
+    # While paging through a backlog keep the original time, so retention is judged from the first page
+    next_watermark["at"] = watermark.get("at", settled) if has_more else settled
+    
+    return {
+        "projects": [with_progress(parse_from_mongo(p)) for p in results["projects"]],
+        "tasks": [parse_from_mongo(t) for t in results["tasks"]],
+        "deleted": [{"kind": t["kind"], "id": t["id"]} for t in results["tombstones"]],
+        "watermark": encode_watermark(next_watermark),
+        "has_more": has_more,
+        "reset": reset
+    }
+
+async def backfill_due_dates():
+    """Rewrite due dates stored before they were normalized into the UTC ISO form"""
+    writes = []
+    async for task in db.tasks.find({"due_date": {"$type": "string", "$not": {"$regex": r"\+00:00$"}}}, {"_id": 0, "id": 1, "due_date": 1}):
+        try:
+            writes.append(UpdateOne({"id": task["id"]}, {"$set": {"due_date": utc_isoformat(task["due_date"])}}))
+        except ValueError:
+            logger.error(f"Task {task['id']} has an unparseable due_date {task['due_date']!r}")
+    if writes:
+        await db.tasks.bulk_write(writes, ordered=False)
+
+async def backfill_updated_at():
+    """Stamp projects and tasks written before updated_at existed with their creation time"""
+    for collection in (db.projects, db.tasks):
+        await collection.update_many({"updated_at": None}, [{"$set": {"updated_at": "$created_at"}}])
+
+# Search
+SEARCH_MAX_LIMIT = 50
+# Ranked hits cannot be keyset-paginated, so paging stops this deep into the results
+SEARCH_MAX_OFFSET = 500
+SEARCH_SNIPPET_CHARS = 160
+SEARCH_TEXT_WEIGHTS = {"title": 5, "description": 1}
+SEARCH_FIELDS = {
+    "project": ("projects", {"_id": 0, "id": 1, "title": 1, "description": 1}),
+    "task": ("tasks", {"_id": 0, "id": 1, "project_id": 1, "title": 1, "description": 1, "status": 1})
+}
+SEARCH_SUFFIXES = ("ing", "ed", "es", "s")
+
+def search_pattern(q):
+    """Regex matching the words a $text search for ``q`` would match, for highlighting"""
+    # Excluded terms ("-word") never appear in hits; quoted phrases are highlighted word by word
+    q = re.sub(r'(^|\s)-\S+', " ", q)
+    stems = set()
+    for term in re.findall(r"\w+", q.lower()):
+        # A crude stand-in for the index's stemming: enough to mark "testing" for "tests"
+        for suffix in SEARCH_SUFFIXES:
+            if term.endswith(suffix) and len(term) - len(suffix) >= 3:
+                term = term[:-len(suffix)]
+                break
+        stems.add(term)
+    if not stems:
+        return None
+    return re.compile(r"\b(?:" + "|".join(sorted(map(re.escape, stems), key=len, reverse=True)) + r")\w*", re.IGNORECASE)
+
+def highlight_snippet(text, pattern):
+    """
+    A window of ``text`` around its first match with the character ranges of
+    every match in it, or None when nothing matches. Ranges rather than markup
+    leave escaping to the client.
+    """
+    matches = list(pattern.finditer(text or "")) if pattern else []
+    if not matches:
+        return None
+    start = max(0, matches[0].start() - SEARCH_SNIPPET_CHARS // 3)
+    if start:
+        space = text.find(" ", start, matches[0].start())
+        start = space + 1 if space != -1 else start
+    end = min(len(text), start + SEARCH_SNIPPET_CHARS)
+    prefix = "\u2026" if start else ""
+    snippet = prefix + text[start:end] + ("\u2026" if end < len(text) else "")
+    offset = len(prefix) - start
+    highlights = [[m.start() + offset, min(m.end(), end) + offset] for m in matches if m.start() < end]
+    return {"snippet": snippet, "highlights": highlights}
+
+@api_router.get("/search")
+async def search(
+    q: str,
+    response: Response,
+    kind: Optional[str] = None,
+    limit: int = 20,
+    cursor: Optional[str] = None,
+    current_user: dict = Depends(get_current_user)
+):
+    """
+    Full-text search over the caller's project and task titles and
+    descriptions, best match first. Titles weigh more than descriptions.
+    Each hit carries a snippet of the matching field with highlight ranges.
+    The next page is given by the ``X-Next-Cursor`` response header.
+    """
+    q = q.strip()
+    if not q:
+        raise HTTPException(status_code=400, detail="Search query is required")
+    if kind is not None and kind not in SEARCH_FIELDS:
+        raise HTTPException(status_code=400, detail=f"kind must be one of {', '.join(SEARCH_FIELDS)}")
+    limit = max(1, min(limit, SEARCH_MAX_LIMIT))
+    offset = 0
+    if cursor:
+        try:
+            offset = int(json.loads(base64.urlsafe_b64decode(cursor.encode()))["offset"])
+        except (ValueError, TypeError, KeyError):
+            raise HTTPException(status_code=400, detail="Invalid cursor")
+    if offset >= SEARCH_MAX_OFFSET:
+        return []
+    
+    # user_id is the text index's prefix key, so each search only scans the caller's entries
+    async def matches(hit_kind):
+        collection, projection = SEARCH_FIELDS[hit_kind]
+        docs = await db[collection].find(
+            {"user_id": current_user["id"], "$text": {"$search": q}},
+            {**projection, "score": {"$meta": "textScore"}}
+        ).sort([("score", {"$meta": "textScore"})]).limit(offset + limit + 1).to_list(offset + limit + 1)
+        return [{**doc, "kind": hit_kind} for doc in docs]
+    
+    kinds = [kind] if kind else list(SEARCH_FIELDS)
+    hits = [hit for docs in await asyncio.gather(*(matches(k) for k in kinds)) for hit in docs]
+    hits.sort(key=lambda hit: (-hit["score"], hit["id"]))
+    page = hits[offset:offset + limit]
+    if len(hits) > offset + limit and offset + limit < SEARCH_MAX_OFFSET:
+        next_cursor = json.dumps({"offset": offset + limit}).encode()
+        response.headers["X-Next-Cursor"] = base64.urlsafe_b64encode(next_cursor).decode()
+    
+    pattern = search_pattern(q)
+    for hit in page:
+        hit["score"] = round(hit["score"], 3)
+        for field in ("title", "description"):
+            highlighted = highlight_snippet(hit.get(field), pattern)
+            if highlighted:
+                hit.update(field=field, **highlighted)
+                break
+        else:
+            hit.update(field="title", snippet=hit["title"], highlights=[])
+        hit.pop("description", None)
+    return page
+
+# Task Due-Date Reminders
+REMINDER_LEAD = timedelta(minutes=int(os.environ.get("REMINDER_LEAD_MINUTES", "60")))
+# How far ahead reminders are held in memory; the rest stay in the due_date index
+REMINDER_WINDOW = timedelta(hours=6)
+# Reminders missed while no server was running, fired late rather than never
+REMINDER_CATCHUP = timedelta(minutes=15)
+REMINDER_BATCH_SIZE = 500
+REMINDER_TICK_SECONDS = 1
+
+class TimingWheel:
+    """
+    Hierarchical timing wheel of keyed timers expiring at integer ticks.
+    
+    Level 0 has one slot per tick and each level above spans ``2 ** bits``
+    times the level below. A timer is filed in the lowest level whose span
+    covers its distance from now and is cascaded down as the lower levels
+    wrap, so schedule and cancel are O(1) and advancing one tick touches only
+    the timers due, plus one cascaded slot when a level wraps, no matter how
+    many timers are pending.
+    """
+    
+    def __init__(self, now, bits=8, levels=3):
+        self.now = now
+        self.bits = bits
+        self.levels = levels
+        self.mask = (1 << bits) - 1
+        self.horizon = 1 << (bits * levels)
+        self._wheels = [[{} for _ in range(1 << bits)] for _ in range(levels)]
+        self._timers = {}  # key -> the slot holding it
+    
+    def __len__(self):
+        return len(self._timers)
+    
+    def __contains__(self, key):
+        return key in self._timers
+    
+    def schedule(self, key, tick, payload):
+        """(Re)schedule ``key``; ticks already past fire on the next advance"""
+        self.cancel(key)
+        self._place(key, max(tick, self.now + 1), payload)
+    
+    def cancel(self, key):
+        slot = self._timers.pop(key, None)
+        if slot is None:
+            return False
+        del slot[key]
+        return True
+    
+    def _place(self, key, tick, payload):
+        delta = tick - self.now
+        level = 0
+        while level < self.levels - 1 and delta >= 1 << (self.bits * (level + 1)):
+            level += 1
+        # Timers beyond the horizon wait in the farthest slot and are re-filed when it cascades
+        slot_tick = min(tick, self.now + self.horizon - 1)
+        slot = self._wheels[level][(slot_tick >> (self.bits * level)) & self.mask]
+        slot[key] = (tick, payload)
+        self._timers[key] = slot
+    
+    def advance(self, to_tick):
+        """Move the clock to ``to_tick`` and return the payloads of the timers that expired"""
+        due = []
+        while self.now < to_tick:
+            self.now += 1
+            level = 1
+            while level < self.levels and (self.now >> (self.bits * (level - 1))) & self.mask == 0:
+                index = (self.now >> (self.bits * level)) & self.mask
+                slot = self._wheels[level][index]
+                self._wheels[level][index] = {}
+                for key, (tick, payload) in slot.items():
+                    self._place(key, tick, payload)
+                level += 1
+            slot = self._wheels[0][self.now & self.mask]
+            self._wheels[0][self.now & self.mask] = {}
+            for key, (_, payload) in slot.items():
+                del self._timers[key]
+                due.append(payload)
+        return due
+
+class TaskReminderScheduler:
+    """
+    Fires task due-date reminders, ``lead`` ahead of the due date, into
+    notifications.
+    
+    Reminders falling within ``window`` of now are held in a TimingWheel of
+    one-second ticks. The window is filled by range reads on the due_date
+    index as it slides forward, never by scanning every task, and the task
+    write paths keep it current through track() and forget(). Fired reminders
+    are re-checked against the tasks, which another server process may have
+    changed, and inserted in batches. A unique index on notifications stops
+    several processes from sending the same reminder twice.
+    """
+    
+    def __init__(self, lead=REMINDER_LEAD, window=REMINDER_WINDOW, batch_size=REMINDER_BATCH_SIZE):
+        self.lead = lead
+        self.window = window
+        self.batch_size = batch_size
+        self.wheel = None
+        self.loaded_until = None  # every reminder due before this is in the wheel
+        self.stats = {"loaded": 0, "fired": 0, "notified": 0}
+    
+    def _remind_at(self, task):
+        due = task.get("due_date")
+        if not due or task.get("status") == "completed":
+            return None
+        due = datetime.fromisoformat(due.replace("Z", "+00:00"))
+        if due.tzinfo is None:
+            due = due.replace(tzinfo=timezone.utc)
+        if due <= datetime.now(timezone.utc):
+            return None
+        return due - self.lead
+    
+    def _schedule(self, task, remind_at):
+        self.wheel.schedule(task["id"], int(remind_at.timestamp()), {
+            "task_id": task["id"],
+            "user_id": task.get("user_id"),
+            "project_id": task["project_id"],
+            "title": task["title"],
+            "due_date": task["due_date"]
+        })
+    
+    def track(self, task):
+        """Schedule, move or drop the reminder of a task as stored after a write"""
+        if self.wheel is None:
+            return
+        remind_at = self._remind_at(task)
+        if remind_at is None or remind_at >= self.loaded_until:
+            # Reminders past the window are picked up by a later load()
+            self.wheel.cancel(task["id"])
+        else:
+            self._schedule(task, remind_at)
+    
+    def forget(self, task_id):
+        if self.wheel is not None:
+            self.wheel.cancel(task_id)
+    
+    async def load(self, until):
+        """Extend the wheel with the reminders due between loaded_until and ``until``"""
+        # due_date is stored as an ISO string, which compares in time order
+        query = {
+            "due_date": {"$gte": (self.loaded_until + self.lead).isoformat(), "$lt": (until + self.lead).isoformat()},
+            "status": {"$ne": "completed"}
+        }
+        projection = {"_id": 0, "id": 1, "user_id": 1, "project_id": 1, "title": 1, "status": 1, "due_date": 1}
+        async for task in db.tasks.find(query, projection).batch_size(5000):
+            remind_at = self._remind_at(task)
+            if remind_at is not None:
+                self._schedule(task, remind_at)
+                self.stats["loaded"] += 1
+        self.loaded_until = until
+    
+    async def start(self):
+        now = datetime.now(timezone.utc)
+        self.wheel = TimingWheel(int(now.timestamp()))
+        self.loaded_until = now - REMINDER_CATCHUP
+        await self.load(now + self.window)
+    
+    async def notify(self, reminders):
+        """Insert notifications for fired reminders whose task is still due as scheduled"""
+        for start in range(0, len(reminders), self.batch_size):
+            batch = reminders[start:start + self.batch_size]
+            current = set()
+            async for task in db.tasks.find(
+                {"id": {"$in": [reminder["task_id"] for reminder in batch]}, "status": {"$ne": "completed"}},
+                {"_id": 0, "id": 1, "due_date": 1}
+            ):
+                current.add((task["id"], task.get("due_date")))
+            created_at = datetime.now(timezone.utc).isoformat()
+            notifications = [
+                {"id": str(uuid.uuid4()), "kind": "task_due", **reminder, "read": False, "created_at": created_at}
+                for reminder in batch if (reminder["task_id"], reminder["due_date"]) in current
+            ]
+            if not notifications:
+                continue
+            try:
+                await db.notifications.insert_many(notifications, ordered=False)
+                self.stats["notified"] += len(notifications)
+            except BulkWriteError as e:
+                # Duplicates were already sent by another server process
+                self.stats["notified"] += e.details.get("nInserted", 0)
+    
+    async def run_forever(self):
+        while True:
+            await asyncio.sleep(REMINDER_TICK_SECONDS)
+            try:
+                now = datetime.now(timezone.utc)
+                due = self.wheel.advance(int(now.timestamp()))
+                if due:
+                    self.stats["fired"] += len(due)
+                    await self.notify(due)
+                if self.loaded_until - now < self.window / 2:
+                    await self.load(now + self.window)
+            except Exception as e:
+                logger.error(f"Task reminders failed: {e}")
+    
+    def snapshot(self):
+        return {**self.stats, "pending": len(self.wheel) if self.wheel else 0}
+
+task_reminders = TaskReminderScheduler()
+task_reminder_task = None
+
+@api_router.get("/notifications")
+async def get_notifications(unread_only: bool = False, limit: int = 50, current_user: dict = Depends(get_current_user)):
+    """The caller's notifications, newest first"""
+    query = {"user_id": current_user["id"]}
+    if unread_only:
+        query["read"] = False
+    limit = max(1, min(limit, PAGE_MAX_LIMIT))
+    notifications = await db.notifications.find(query, {"_id": 0}).sort("created_at", -1).limit(limit).to_list(limit)
+    return [parse_from_mongo(notification) for notification in notifications]
 
 # Quiz Routes
 @api_router.get("/quiz/questions/{category}")
-async def get_quiz_questions(category: str):
-    if category == "aptitude":
-        return APTITUDE_QUESTIONS
-    elif category == "coding":
-        return CODING_QUESTIONS
-    else:
+async def get_quiz_questions(
+    category: str,
+    sub_category: Optional[str] = None,
+    difficulty: Optional[str] = None,
+    language: Optional[str] = None,
+    limit: int = 50
+):
+    """
+    Practice questions, at most ``limit`` drawn at random from the matching bank
+    bucket. Public, so answers and hidden tests are left out; submissions are
+    graded by the server.
+    """
+    if category not in QUIZ_CATEGORIES:
         raise HTTPException(status_code=400, detail="Invalid category")
+    
+    questions = QUESTION_BANK.sample(max(1, min(limit, 200)), category, sub_category, difficulty, language)
+    return [QuestionBank.public(question) for question in questions]
 
-@api_router.post("/quiz/session", response_model=QuizSession)
-async def create_quiz_session(category: str, current_user: dict = Depends(get_current_user)):
+@api_router.post("/quiz/session", response_model=QuizSessionStart)
+async def create_quiz_session(
+    category: str,
+    count: int = 10,
+    sub_category: Optional[str] = None,
+    difficulty: Optional[str] = None,
+    language: Optional[str] = None,
+    current_user: dict = Depends(get_current_user)
+):
+    if category not in QUIZ_CATEGORIES:
+        raise HTTPException(status_code=400, detail="Invalid category")
+    
+    questions = QUESTION_BANK.sample(max(1, min(count, 100)), category, sub_category, difficulty, language)
+    if not questions:
+        raise HTTPException(status_code=404, detail="No questions match the requested filters")
+    
     session = QuizSession(
         user_id=current_user["id"],
         category=category,
-        total_questions=len(APTITUDE_QUESTIONS if category == "aptitude" else CODING_QUESTIONS)
+        total_questions=len(questions),
+        question_ids=[q["id"] for q in questions]
     )
     
     session_dict = prepare_for_mongo(session.dict())
-    await db.quiz_sessions.insert_one(session_dict)
+    await asyncio.gather(
+        db.quiz_sessions.insert_one(session_dict),
+        db.quiz_stats.bulk_write(quiz_stats_updates(current_user["id"], category, sessions=1), ordered=False),
+        db.dashboard_views.bulk_write([dashboard_quiz_update(current_user["id"], sessions=1)])
+    )
+    quiz_leaderboard.record(current_user["id"], current_user.get("college"), category)
     
-    return session
+    return QuizSessionStart(**session.dict(), questions=[QuestionBank.public(q) for q in questions])
+
+QUIZ_STATS_RECENT_SCORES = 10
+QUIZ_STATS_REBUILD_ATTEMPTS = 5
+
+def quiz_stats_update(sessions=0, score=0, completed_score=None):
+    """Update document folding a session or answer write into a quiz_stats rollup"""
+    update = {
+        "$inc": {"sessions": sessions, "score_sum": score},
+        "$set": {"updated_at": datetime.now(timezone.utc).isoformat()}
+    }
+    if completed_score is not None:
+        update["$inc"]["completed_sessions"] = 1
+        update["$max"] = {"best_score": completed_score}
+        update["$push"] = {"recent_scores": {"$each": [completed_score], "$slice": -QUIZ_STATS_RECENT_SCORES}}
+    return update
+
+def quiz_stats_updates(user_id, category, sessions=0, score=0, completed_score=None):
+    """
+    Upserts that fold a session or answer write into the user's quiz_stats
+    rollups: one document for the category and one across all categories
+    """
+    update = quiz_stats_update(sessions, score, completed_score)
+    return [
+        UpdateOne({"user_id": user_id, "category": key}, update, upsert=True)
+        for key in (category, "all")
+    ]
+
+def dashboard_quiz_update(user_id, sessions=0, score=0, completed_score=None):
+    """The same fold applied to the "all" rollup copy embedded in the user's dashboard view"""
+    update = quiz_stats_update(sessions, score, completed_score)
+    return UpdateOne(
+        {"user_id": user_id},
+        {op: {f"quiz_stats.{field}": value for field, value in fields.items()} for op, fields in update.items()}
+    )
+
+async def rebuild_quiz_stats(user_id):
+    """
+    Recompute a user's rollups from quiz_sessions, for users whose history
+    predates them. Each write only lands if the rollup is unchanged since it
+    was read, so a concurrent $inc makes the rebuild start over instead of
+    being overwritten.
+    """
+    pipeline = [
+        {"$match": {"user_id": user_id}},
+        {"$sort": {"created_at": 1}},
+        {"$group": {
+            "_id": "$category",
+            "sessions": {"$sum": 1},
+            "score_sum": {"$sum": "$score"},
+            "completed_scores": {"$push": {"$cond": [{"$eq": ["$completed", True]}, "$score", None]}}
+        }}
+    ]
+    for _ in range(QUIZ_STATS_REBUILD_ATTEMPTS):
+        seen = {
+            doc["category"]: doc.get("updated_at")
+            async for doc in db.quiz_stats.find({"user_id": user_id}, {"_id": 0, "category": 1, "updated_at": 1})
+        }
+        rollups = {"all": {"sessions": 0, "score_sum": 0, "completed": []}}
+        async for group in db.quiz_sessions.aggregate(pipeline):
+            completed = [score for score in group["completed_scores"] if score is not None]
+            for key in (group["_id"], "all"):
+                rollup = rollups.setdefault(key, {"sessions": 0, "score_sum": 0, "completed": []})
+                rollup["sessions"] += group["sessions"]
+                rollup["score_sum"] += group["score_sum"]
+                rollup["completed"].extend(completed)
+        
+        now = datetime.now(timezone.utc).isoformat()
+        docs = {
+            key: {
+                "user_id": user_id,
+                "category": key,
+                "sessions": rollup["sessions"],
+                "score_sum": rollup["score_sum"],
+                "completed_sessions": len(rollup["completed"]),
+                "best_score": max(rollup["completed"], default=0),
+                "recent_scores": rollup["completed"][-QUIZ_STATS_RECENT_SCORES:],
+                "updated_at": now,
+                "rebuilt_at": now
+            }
+            for key, rollup in rollups.items()
+        }
+        try:
+            result = await db.quiz_stats.bulk_write(
+                [
+                    UpdateOne(
+                        {"user_id": user_id, "category": key, "updated_at": seen.get(key)},
+                        {"$set": doc},
+                        upsert=key not in seen
+                    )
+                    for key, doc in docs.items()
+                ],
+                ordered=False
+            )
+            if result.matched_count + result.upserted_count == len(docs):
+                break
+        except BulkWriteError as e:
+            # A rollup that did not exist when read was inserted by a concurrent write
+            if any(error["code"] != 11000 for error in e.details["writeErrors"]):
+                raise
+    else:
+        logger.warning(f"quiz_stats rebuild for {user_id} kept racing concurrent writes")
+    
+    # The dashboard view embeds the "all" rollup; have its next read rebuild it
+    await db.dashboard_views.update_one({"user_id": user_id}, {"$unset": {"rebuilt_at": ""}})
+    return docs
+
+async def backfill_quiz_stats():
+    """Rebuild the rollups of every user with quiz history that no rebuild has verified yet"""
+    rebuilt = set(await db.quiz_stats.distinct("user_id", {"category": "all", "rebuilt_at": {"$ne": None}}))
+    for user_id in await db.quiz_sessions.distinct("user_id"):
+        if user_id not in rebuilt:
+            await rebuild_quiz_stats(user_id)
+
+def summarize_quiz_stats(rollup):
+    """Progress view of a quiz_stats rollup document"""
+    sessions = rollup.get("sessions", 0)
+    recent = rollup.get("recent_scores", [])
+    half = len(recent) // 2
+    # Trend: mean of the newer half of recent scores minus mean of the older half
+    trend = sum(recent[half:]) / (len(recent) - half) - sum(recent[:half]) / half if half else 0
+    return {
+        "total_sessions": sessions,
+        "average_score": rollup.get("score_sum", 0) / sessions if sessions else 0,
+        "best_score": rollup.get("best_score", 0),
+        "recent_scores": recent,
+        "trend": round(trend, 1)
+    }
+
+class ScoreBoard:
+    """
+    Ranked scores of one leaderboard.
+    
+    A Fenwick tree over integer score values counts the students at each score,
+    so rank lookups and score changes cost O(log max_score) and top-N walks only
+    the distinct scores it returns. Students with equal scores share a rank and
+    are listed in the order they reached the score.
+    """
+    
+    def __init__(self, size=64):
+        self._size = size
+        self._tree = [0] * (size + 1)
+        self._scores = {}    # user_id -> score
+        self._by_score = {}  # score -> {user_id: None}, in arrival order
+    
+    def __len__(self):
+        return len(self._scores)
+    
+    def _add_count(self, score, delta):
+        i = score + 1
+        while i <= self._size:
+            self._tree[i] += delta
+            i += i & -i
+    
+    def _count_upto(self, score):
+        """Number of students with a score <= ``score``"""
+        i = min(score + 1, self._size)
+        total = 0
+        while i > 0:
+            total += self._tree[i]
+            i -= i & -i
+        return total
+    
+    def _grow(self, score):
+        size = self._size
+        while size < score + 1:
+            size *= 2
+        self._size = size
+        self._tree = [0] * (size + 1)
+        for value, users in self._by_score.items():
+            self._add_count(value, len(users))
+    
+    def _score_at(self, k):
+        """The k-th lowest score (1-based) by Fenwick descent"""
+        i = 0
+        step = 1 << self._size.bit_length()
+        while step:
+            j = i + step
+            if j <= self._size and self._tree[j] < k:
+                i = j
+                k -= self._tree[j]
+            step >>= 1
+        return i
+    
+    def set(self, user_id, score):
+        score = max(0, int(score))
+        previous = self._scores.get(user_id)
+        if previous == score:
+            return
+        if previous is not None:
+            users = self._by_score[previous]
+            del users[user_id]
+            if not users:
+                del self._by_score[previous]
+            self._add_count(previous, -1)
+        if score + 1 > self._size:
+            self._grow(score)
+        self._scores[user_id] = score
+        self._by_score.setdefault(score, {})[user_id] = None
+        self._add_count(score, 1)
+    
+    def add(self, user_id, delta):
+        self.set(user_id, self._scores.get(user_id, 0) + delta)
+    
+    def remove(self, user_id):
+        score = self._scores.pop(user_id, None)
+        if score is None:
+            return None
+        users = self._by_score[score]
+        del users[user_id]
+        if not users:
+            del self._by_score[score]
+        self._add_count(score, -1)
+        return score
+    
+    def score(self, user_id):
+        return self._scores.get(user_id)
+    
+    def rank(self, user_id):
+        """1 + number of students with a strictly higher score, or None if not ranked"""
+        score = self._scores.get(user_id)
+        if score is None:
+            return None
+        return len(self._scores) - self._count_upto(score) + 1
+    
+    def top(self, n):
+        """Up to ``n`` (rank, user_id, score) entries, best first"""
+        entries = []
+        total = len(self._scores)
+        rank = 1
+        while len(entries) < n and rank <= total:
+            score = self._score_at(total - rank + 1)
+            users = self._by_score[score]
+            for user_id in users:
+                if len(entries) == n:
+                    break
+                entries.append((rank, user_id, score))
+            rank += len(users)
+        return entries
+
+class QuizLeaderboard:
+    """
+    In-process leaderboards of total quiz score per (college, category), plus an
+    "all" category mirroring the quiz_stats rollups. Loaded from quiz_stats on
+    startup, updated as scores change and periodically reloaded so that scores
+    written by other server processes are picked up.
+    """
+    
+    def __init__(self):
+        self._boards = {}
+    
+    def board(self, college, category):
+        return self._boards.get((college, category))
+    
+    def record(self, user_id, college, category, delta=0):
+        """Credit ``delta`` points to the student; a zero delta just enrols them"""
+        if not college:
+            return
+        for key in (category, "all"):
+            board = self._boards.setdefault((college, key), ScoreBoard())
+            board.add(user_id, delta)
+    
+    def move(self, user_id, old_college, new_college):
+        """Carry a student's scores over when their college changes"""
+        if old_college == new_college:
+            return
+        for (college, category), board in list(self._boards.items()):
+            if college != old_college:
+                continue
+            score = board.remove(user_id)
+            if score is not None and new_college:
+                self._boards.setdefault((new_college, category), ScoreBoard()).set(user_id, score)
+    
+    async def load(self):
+        """Rebuild every board from quiz_stats and swap them in at once"""
+        colleges = {}
+        async for user in db.users.find({"college": {"$nin": ["", None]}}, {"_id": 0, "id": 1, "college": 1}):
+            colleges[user["id"]] = user["college"]
+        
+        boards = {}
+        async for rollup in db.quiz_stats.find({}, {"_id": 0, "user_id": 1, "category": 1, "score_sum": 1}):
+            college = colleges.get(rollup["user_id"])
+            if college:
+                boards.setdefault((college, rollup["category"]), ScoreBoard()).set(
+                    rollup["user_id"], rollup.get("score_sum", 0)
+                )
+        self._boards = boards
+    
+    async def refresh_forever(self, interval):
+        while True:
+            await asyncio.sleep(interval)
+            try:
+                await self.load()
+            except Exception as e:
+                logger.error(f"Leaderboard reload failed: {e}")
+
+quiz_leaderboard = QuizLeaderboard()
+leaderboard_refresh_task = None
+LEADERBOARD_REFRESH_SECONDS = float(os.environ.get("LEADERBOARD_REFRESH_SECONDS", "300"))
+
+class QuizAnswerWriter:
+    """
+    Group-commit writer for quiz answer ingestion.
+    
+    Answers from concurrent requests are buffered and flushed together as one
+    unordered bulk_write into quiz_answers, followed by bulk_writes of
+    per-session score increments and quiz_stats rollup increments. A batch is flushed once it reaches
+    ``max_batch`` answers or its oldest answer has waited ``max_delay``
+    seconds. Callers are acknowledged once their answer is journaled; an
+    answer already stored for the same question is acknowledged without
+    being scored again, so client retries are idempotent.
+    """
+    
+    def __init__(self, max_batch=500, max_delay=0.02):
+        self.max_batch = max_batch
+        self.max_delay = max_delay
+        self._pending = []  # (answer_doc, session_id, score_inc, stats_key, future)
+        self._has_pending = None
+        self._batch_full = None
+        self._closing = False
+        self._task = None
+        self.stats = {
+            "batches_flushed": 0,
+            "answers_written": 0,
+            "duplicate_answers": 0,
+            "failed_answers": 0,
+            "failed_derived_writes": 0,
+            "last_batch_size": 0,
+            "max_batch_size": 0,
+            "last_flush_ms": 0.0,
+            "max_flush_ms": 0.0,
+            "total_flush_ms": 0.0
+        }
+    
+    @property
+    def backlog(self):
+        return len(self._pending)
+    
+    def snapshot(self):
+        flushed = self.stats["batches_flushed"]
+        return {
+            **self.stats,
+            "total_flush_ms": round(self.stats["total_flush_ms"], 2),
+            "backlog": self.backlog,
+            "avg_batch_size": round(self.stats["answers_written"] / flushed, 1) if flushed else 0,
+            "avg_flush_ms": round(self.stats["total_flush_ms"] / flushed, 2) if flushed else 0,
+            "max_batch": self.max_batch,
+            "max_delay_ms": self.max_delay * 1000
+        }
+    
+    def start(self):
+        """Start the flush loop on the running event loop"""
+        if self._task is None or self._task.done():
+            self._closing = False
+            self._has_pending = asyncio.Event()
+            self._batch_full = asyncio.Event()
+            self._task = asyncio.create_task(self._run())
+    
+    async def close(self):
+        """Stop the flush loop after writing everything still buffered"""
+        if self._task is None:
+            return
+        self._closing = True
+        self._has_pending.set()
+        self._batch_full.set()
+        await self._task
+        self._task = None
+    
+    async def submit(self, answer_doc, session_id, score_inc=0, stats_key=None):
+        """
+        Buffer one answer and wait until the batch containing it is durable.
+        ``stats_key`` is the (user_id, category, college) rollup and leaderboard
+        entry credited with ``score_inc``.
+        """
+        self.start()
+        future = asyncio.get_running_loop().create_future()
+        self._pending.append((answer_doc, session_id, score_inc, stats_key, future))
+        self._has_pending.set()
+        if len(self._pending) >= self.max_batch:
+            self._batch_full.set()
+        await future
+    
+    def _take_batch(self):
+        batch = self._pending[:self.max_batch]
+        del self._pending[:self.max_batch]
+        if len(self._pending) < self.max_batch:
+            self._batch_full.clear()
+        if not self._pending:
+            self._has_pending.clear()
+        return batch
+    
+    async def _run(self):
+        while self._pending or not self._closing:
+            if not self._pending:
+                await self._has_pending.wait()
+                continue
+            if not self._closing:
+                try:
+                    await asyncio.wait_for(self._batch_full.wait(), timeout=self.max_delay)
+                except asyncio.TimeoutError:
+                    pass
+            await self._flush(self._take_batch())
+    
+    async def _flush(self, batch):
+        if not batch:
+            return
+        started = time.perf_counter()
+        durable = WriteConcern(w="majority", j=True)
+        
+        # Unordered inserts: every answer is attempted and errors are reported per index
+        failed = {}
+        duplicates = set()
+        try:
+            await db.quiz_answers.with_options(write_concern=durable).bulk_write(
+                [InsertOne(answer_doc) for answer_doc, _, _, _, _ in batch], ordered=False
+            )
+        except BulkWriteError as e:
+            for write_error in e.details.get("writeErrors", []):
+                # A duplicate (session_id, question_id) is a retry of an answer already stored and counted
+                if write_error["code"] == 11000:
+                    duplicates.add(write_error["index"])
+                else:
+                    failed[write_error["index"]] = write_error.get("errmsg")
+        except Exception as e:
+            failed = {index: str(e) for index in range(len(batch))}
+        
+        # The answers are stored now: acknowledge them before the derived writes
+        for index, (_, _, _, _, future) in enumerate(batch):
+            if future.done():
+                continue
+            if index in failed:
+                future.set_exception(HTTPException(status_code=503, detail="Failed to store answer"))
+            else:
+                future.set_result(None)
+        if failed:
+            logger.error(f"Quiz answer batch flush failed for {len(failed)} answers: {next(iter(failed.values()))}")
+        
+        # Coalesce score increments of the newly written answers per session and per rollup
+        increments = {}
+        stats_increments = {}
+        for index, (_, session_id, score_inc, stats_key, _) in enumerate(batch):
+            if score_inc and index not in failed and index not in duplicates:
+                increments[session_id] = increments.get(session_id, 0) + score_inc
+                if stats_key is not None:
+                    stats_increments[stats_key] = stats_increments.get(stats_key, 0) + score_inc
+        if increments:
+            await self._apply_increments(increments, stats_increments, durable)
+        
+        written = len(batch) - len(failed) - len(duplicates)
+        elapsed_ms = (time.perf_counter() - started) * 1000
+        self.stats["batches_flushed"] += 1
+        self.stats["answers_written"] += written
+        self.stats["duplicate_answers"] += len(duplicates)
+        self.stats["failed_answers"] += len(failed)
+        self.stats["last_batch_size"] = len(batch)
+        self.stats["max_batch_size"] = max(self.stats["max_batch_size"], len(batch))
+        self.stats["last_flush_ms"] = round(elapsed_ms, 2)
+        self.stats["max_flush_ms"] = round(max(self.stats["max_flush_ms"], elapsed_ms), 2)
+        self.stats["total_flush_ms"] += elapsed_ms
+    
+    async def _apply_increments(self, increments, stats_increments, durable):
+        """
+        Fold the scores of stored answers into their sessions, rollups and the
+        leaderboard. These are derived data: a failure is logged and counted,
+        never reported to the answers, and a failed rollup write drops the
+        rollup's rebuilt_at marker so the next read rebuilds it from quiz_sessions.
+        """
+        stats_ops = [
+            op for (user_id, category, _), inc in stats_increments.items()
+            for op in quiz_stats_updates(user_id, category, score=inc)
+        ]
+        writes = [db.quiz_sessions.with_options(write_concern=durable).bulk_write(
+            [UpdateOne({"id": session_id}, {"$inc": {"score": inc}}) for session_id, inc in increments.items()],
+            ordered=False
+        )]
+        if stats_ops:
+            writes.append(db.quiz_stats.with_options(write_concern=durable).bulk_write(stats_ops, ordered=False))
+        results = await asyncio.gather(*writes, return_exceptions=True)
+        for result in results:
+            if isinstance(result, Exception):
+                self.stats["failed_derived_writes"] += 1
+                logger.error(f"Quiz answer score update failed: {result}")
+        if not stats_ops:
+            return
+        
+        if isinstance(results[-1], Exception):
+            try:
+                await db.quiz_stats.update_many(
+                    {"user_id": {"$in": list({user_id for user_id, _, _ in stats_increments})}, "category": "all"},
+                    {"$unset": {"rebuilt_at": ""}}
+                )
+            except Exception as e:
+                logger.error(f"Quiz stats rebuild marker reset failed: {e}")
+            return
+        
+        user_increments = {}
+        for (user_id, category, college), inc in stats_increments.items():
+            quiz_leaderboard.record(user_id, college, category, inc)
+            user_increments[user_id] = user_increments.get(user_id, 0) + inc
+        # Dashboard views are derived data: a failed update is logged, not reported to the answers
+        try:
+            await db.dashboard_views.bulk_write(
+                [dashboard_quiz_update(user_id, score=inc) for user_id, inc in user_increments.items()],
+                ordered=False
+            )
+        except Exception as e:
+            logger.error(f"Dashboard view update failed: {e}")
+
+quiz_answer_writer = QuizAnswerWriter(
+    max_batch=int(os.environ.get("QUIZ_WRITER_MAX_BATCH", "500")),
+    max_delay=float(os.environ.get("QUIZ_WRITER_MAX_DELAY_MS", "20")) / 1000
+)
 
 @api_router.post("/quiz/answer")
 async def submit_quiz_answer(answer: QuizAnswer, current_user: dict = Depends(get_current_user)):
+    """Submit one answer of a quiz session, graded against the question bank"""
+    question = QUESTION_BANK.get(answer.question_id)
+    if question is None:
+        raise HTTPException(status_code=400, detail=f"Unknown question: {answer.question_id}")
+    
     # Verify session ownership
-    session = await db.quiz_sessions.find_one({"id": answer.session_id, "user_id": current_user["id"]})
+    session = await db.quiz_sessions.find_one(
+        {"id": answer.session_id, "user_id": current_user["id"]},
+        {"_id": 0, "category": 1, "question_ids": 1, "completed": 1}
+    )
     if not session:
         raise HTTPException(status_code=404, detail="Session not found")
+    if session.get("completed"):
+        raise HTTPException(status_code=409, detail="Session already completed")
+    # Sessions created before questions were drawn per session still only take their category's questions
+    if session.get("question_ids"):
+        if answer.question_id not in session["question_ids"]:
+            raise HTTPException(status_code=400, detail="Question is not part of this session")
+    elif QUESTION_BANK.categories[answer.question_id] != session.get("category"):
+        raise HTTPException(status_code=400, detail="Question is not part of this session")
+    
+    is_correct = answer.selected_answer == question.get("correct_answer")
+    
+    # Insert and score update go through the group-commit writer
+    answer_dict = prepare_for_mongo({**answer.dict(), "is_correct": is_correct})
+    await quiz_answer_writer.submit(
+        answer_dict,
+        answer.session_id,
+        1 if is_correct else 0,
+        stats_key=(current_user["id"], session.get("category"), current_user.get("college"))
+    )
+    
+    return {"message": "Answer submitted", "is_correct": is_correct}
+
+@api_router.get("/quiz/stats")
+async def get_quiz_stats(current_user: dict = Depends(get_current_user)):
+    """Per-category quiz progress read from the user's rollup documents"""
+    rollups = await db.quiz_stats.find({"user_id": current_user["id"]}, {"_id": 0}).to_list(20)
+    # Rollups that write paths created by $inc alone miss the history from before them
+    if not any(rollup["category"] == "all" and rollup.get("rebuilt_at") for rollup in rollups):
+        rollups = list((await rebuild_quiz_stats(current_user["id"])).values())
+    return {rollup["category"]: summarize_quiz_stats(rollup) for rollup in rollups}
+
+@api_router.get("/quiz/leaderboard/{category}")
+async def get_quiz_leaderboard(category: str, limit: int = 10, current_user: dict = Depends(get_current_user)):
+    """Top students of the current user's college by total quiz score, and the user's own rank"""
+    if category not in QUIZ_CATEGORIES + ("all",):
+        raise HTTPException(status_code=400, detail="Invalid category")
+    college = current_user.get("college")
+    if not college:
+        raise HTTPException(status_code=400, detail="Add your college to your profile to join a leaderboard")
+    
+    board = quiz_leaderboard.board(college, category) or ScoreBoard()
+    top = board.top(max(1, min(limit, 100)))
+    names = {}
+    if top:
+        async for user in db.users.find({"id": {"$in": [user_id for _, user_id, _ in top]}}, {"_id": 0, "id": 1, "name": 1}):
+            names[user["id"]] = user.get("name", "")
+    
+    return {
+        "college": college,
+        "category": category,
+        "total_students": len(board),
+        "top": [
+            {"rank": rank, "user_id": user_id, "name": names.get(user_id, ""), "score": score}
+            for rank, user_id, score in top
+        ],
+        "me": {"rank": board.rank(current_user["id"]), "score": board.score(current_user["id"])}
+    }
+
+@api_router.get("/quiz/writer-stats")
+async def get_quiz_writer_stats(current_user: dict = Depends(get_current_user)):
+    """Batch size, flush latency and backlog of the quiz answer writer"""
+    return quiz_answer_writer.snapshot()
+
+@api_router.post("/quiz/answers")
+async def submit_quiz_answers(batch: QuizAnswerBatch, current_user: dict = Depends(get_current_user)):
+    """Submit all answers of a quiz session at once, graded against the question bank"""
+    if not batch.answers:
+        raise HTTPException(status_code=400, detail="No answers provided")
+    
+    answer_docs = []
+    results = []
+    for item in batch.answers:
+        question = QUESTION_BANK.get(item.question_id)
+        if question is None:
+            raise HTTPException(status_code=400, detail=f"Unknown question: {item.question_id}")
+        is_correct = item.selected_answer == question.get("correct_answer")
+        answer_docs.append(prepare_for_mongo(QuizAnswer(
+            session_id=batch.session_id,
+            question_id=item.question_id,
+            selected_answer=item.selected_answer,
+            is_correct=is_correct
+        ).dict()))
+        results.append({
+            "question_id": item.question_id,
+            "is_correct": is_correct,
+            "correct_answer": question.get("correct_answer")
+        })
+    
+    submitted_ids = [item.question_id for item in batch.answers]
+    if len(set(submitted_ids)) != len(submitted_ids):
+        raise HTTPException(status_code=400, detail="Each question can only be answered once")
+    
+    # Ownership check and question membership
+    session = await db.quiz_sessions.find_one(
+        {
+            "id": batch.session_id,
+            "user_id": current_user["id"],
+            "completed": {"$ne": True},
+            "$or": [
+                {"question_ids": {"$all": submitted_ids}},
+                {"question_ids": {"$in": [None, []]}}  # sessions created before questions were drawn per session
+            ]
+        },
+        {"_id": 0, "id": 1}
+    )
+    if not session:
+        existing = await db.quiz_sessions.find_one(
+            {"id": batch.session_id, "user_id": current_user["id"]},
+            {"_id": 0, "completed": 1}
+        )
+        if not existing:
+            raise HTTPException(status_code=404, detail="Session not found")
+        if existing.get("completed"):
+            raise HTTPException(status_code=409, detail="Session already completed")
+        raise HTTPException(status_code=400, detail="Answers include questions that are not part of this session")
+    
+    # Answers are stored before the session is closed, so a failed insert leaves
+    # the session open for a retry; answers kept from an earlier attempt are
+    # rejected by the unique (session_id, question_id) index and not stored twice.
+    # Those were credited when they were stored, so only inserted answers score.
+    duplicates = set()
+    try:
+        await db.quiz_answers.insert_many(answer_docs, ordered=False)
+    except BulkWriteError as e:
+        for error in e.details.get("writeErrors", []):
+            if error.get("code") != 11000:
+                raise
+            duplicates.add(error["index"])
+    score = sum(1 for index, result in enumerate(results) if result["is_correct"] and index not in duplicates)
+    
+    # Score and completion in one write; the score never exceeds the session's question count
+    previous = await db.quiz_sessions.find_one_and_update(
+        {"id": batch.session_id, "user_id": current_user["id"], "completed": {"$ne": True}},
+        [{"$set": {
+            "completed": True,
+            "score": {"$min": [{"$add": [{"$ifNull": ["$score", 0]}, score]}, "$total_questions"]}
+        }}],
+        projection={"_id": 0},
+        return_document=ReturnDocument.BEFORE
+    )
+    if not previous:
+        raise HTTPException(status_code=409, detail="Session already completed")
+    session = {**previous, "completed": True, "score": min(previous.get("score", 0) + score, previous["total_questions"])}
+    score = session["score"] - previous.get("score", 0)
+    
+    await asyncio.gather(
+        db.quiz_stats.bulk_write(
+            quiz_stats_updates(current_user["id"], session["category"], score=score, completed_score=session["score"]),
+            ordered=False
+        ),
+        db.dashboard_views.bulk_write([dashboard_quiz_update(current_user["id"], score=score, completed_score=session["score"])]),
+        record_score(
+            current_user["id"],
+            "quiz",
+            session["category"],
+            round(100 * session["score"] / max(session["total_questions"], 1), 1),
+            batch.session_id
+        )
+    )
+    quiz_leaderboard.record(current_user["id"], current_user.get("college"), session["category"], score)
     
-    answer_dict = prepare_for_mongo(answer.dict())
-    await db.quiz_answers.insert_one(answer_dict)
+    return {
+        "message": f"{len(answer_docs)} answers submitted",
+        "score": session["score"],
+        "total_questions": session["total_questions"],
+        "results": results
+    }
+
+CODE_SUBMISSION_MAX_CHARS = 20000
+
+coding_grader = CodeGraderPool(
+    workers=int(os.environ.get("CODE_GRADER_WORKERS", "2")),
+    time_limit=float(os.environ.get("CODE_GRADER_TIME_LIMIT", "2")),
+    memory_mb=int(os.environ.get("CODE_GRADER_MEMORY_MB", "256"))
+)
+
+@api_router.post("/quiz/coding/{question_id}/submit")
+async def submit_coding_answer(question_id: str, submission: CodeSubmission, current_user: dict = Depends(get_current_user)):
+    """Run submitted Python against the question's test cases in the grader sandbox"""
+    question = QUESTION_BANK.get(question_id)
+    if question is None or not question.get("test_cases"):
+        raise HTTPException(status_code=404, detail="Coding question not found")
+    if question.get("language") != "python":
+        raise HTTPException(status_code=400, detail="Only Python submissions can be graded")
+    if not submission.code.strip() or len(submission.code) > CODE_SUBMISSION_MAX_CHARS:
+        raise HTTPException(status_code=400, detail=f"Code must be 1-{CODE_SUBMISSION_MAX_CHARS} characters")
+    
+    result, cached = await coding_grader.grade(question_id, question["function"], question["test_cases"], submission.code)
+    
+    await db.code_submissions.insert_one({
+        "id": str(uuid.uuid4()),
+        "user_id": current_user["id"],
+        "question_id": question_id,
+        "code": submission.code,
+        "status": result["status"],
+        "passed": result.get("passed", 0),
+        "total": result.get("total", len(question["test_cases"])),
+        "created_at": datetime.now(timezone.utc).isoformat()
+    })
     
-    # Update session score
-    if answer.is_correct:
-        await db.quiz_sessions.update_one(
-            {"id": answer.session_id},
-            {"$inc": {"score": 1}}
+    return {**result, "question_id": question_id, "cached": cached}
+
+@api_router.get("/quiz/coding/grader-stats")
+async def get_coding_grader_stats(current_user: dict = Depends(get_current_user)):
+    """Submissions graded, cache hits and worker restarts of the grader pool"""
+    return coding_grader.snapshot()
+
+# Score History
+SCORE_HISTORY_KINDS = {"quiz": QUIZ_CATEGORIES, "interview": ("hr", "technical")}
+SCORE_ROLLUP_PERIODS = ("day", "week")
+PROGRESS_MAX_POINTS = 366
+PROGRESS_RAW_MAX_DAYS = 31
+
+def score_period_start(day, period):
+    """First day of the rollup period containing ``day``; weeks start on Monday"""
+    if period == "week":
+        day = day - timedelta(days=day.weekday())
+    return day.isoformat()
+
+async def record_score(user_id, kind, category, score, session_id):
+    """
+    Append a session result to the score_history time-series collection and
+    fold it into the user's daily and weekly score_rollups
+    """
+    # Time-series collections need a real date in the time field, not an ISO string
+    ts = datetime.now(timezone.utc)
+    point = {
+        "ts": ts,
+        "meta": {"user_id": user_id, "kind": kind, "category": category},
+        "score": score,
+        "session_id": session_id
+    }
+    rollup_ops = [
+        UpdateOne(
+            {
+                "user_id": user_id,
+                "kind": kind,
+                "category": category,
+                "period": period,
+                "start": score_period_start(ts.date(), period)
+            },
+            {"$inc": {"count": 1, "sum": score}, "$min": {"min": score}, "$max": {"max": score}},
+            upsert=True
         )
+        for period in SCORE_ROLLUP_PERIODS
+    ]
+    await asyncio.gather(
+        db.score_history.insert_one(point),
+        db.score_rollups.bulk_write(rollup_ops, ordered=False)
+    )
+
+def parse_progress_date(value, default):
+    if value is None:
+        return default
+    try:
+        return datetime.fromisoformat(value).date()
+    except ValueError:
+        raise HTTPException(status_code=400, detail=f"Invalid date: {value}")
+
+@api_router.get("/progress/{kind}/{category}")
+async def get_score_progress(
+    kind: str,
+    category: str,
+    start: Optional[str] = None,
+    end: Optional[str] = None,
+    resolution: str = "auto",
+    current_user: dict = Depends(get_current_user)
+):
+    """
+    Score trajectory for one quiz category or interview type. Reads at most
+    PROGRESS_MAX_POINTS raw points or rollup buckets whatever the range: ``auto``
+    returns raw session results for short ranges and falls back to daily, then
+    weekly rollups as the range grows.
+    """
+    if category not in SCORE_HISTORY_KINDS.get(kind, ()):
+        raise HTTPException(status_code=400, detail="Invalid kind or category")
+    if resolution not in ("auto", "raw") + SCORE_ROLLUP_PERIODS:
+        raise HTTPException(status_code=400, detail="Invalid resolution")
+    
+    end_day = parse_progress_date(end, datetime.now(timezone.utc).date())
+    start_day = parse_progress_date(start, end_day - timedelta(days=89))
+    if start_day > end_day:
+        raise HTTPException(status_code=400, detail="start must not be after end")
+    days = (end_day - start_day).days + 1
+    
+    points = None
+    if resolution == "raw" or (resolution == "auto" and days <= PROGRESS_RAW_MAX_DAYS):
+        cursor = db.score_history.find(
+            {
+                "meta.user_id": current_user["id"],
+                "meta.kind": kind,
+                "meta.category": category,
+                "ts": {
+                    "$gte": datetime.combine(start_day, datetime.min.time(), timezone.utc),
+                    "$lt": datetime.combine(end_day + timedelta(days=1), datetime.min.time(), timezone.utc)
+                }
+            },
+            {"_id": 0, "ts": 1, "score": 1}
+        ).sort("ts", -1).limit(PROGRESS_MAX_POINTS + 1)
+        history = await cursor.to_list(PROGRESS_MAX_POINTS + 1)
+        if resolution == "raw" or len(history) <= PROGRESS_MAX_POINTS:
+            # An explicit raw request keeps the most recent points
+            points = [
+                {"t": p["ts"].isoformat(), "count": 1, "average": p["score"], "min": p["score"], "max": p["score"]}
+                for p in reversed(history[:PROGRESS_MAX_POINTS])
+            ]
+            resolution = "raw"
+        else:
+            resolution = "auto"
+    
+    if points is None:
+        if resolution == "auto":
+            resolution = "day" if days <= PROGRESS_MAX_POINTS else "week"
+        span = timedelta(days=PROGRESS_MAX_POINTS * (7 if resolution == "week" else 1) - 1)
+        start_day = max(start_day, end_day - span)
+        rollups = await db.score_rollups.find(
+            {
+                "user_id": current_user["id"],
+                "kind": kind,
+                "category": category,
+                "period": resolution,
+                "start": {
+                    "$gte": score_period_start(start_day, resolution),
+                    "$lte": score_period_start(end_day, resolution)
+                }
+            },
+            {"_id": 0, "start": 1, "count": 1, "sum": 1, "min": 1, "max": 1}
+        ).sort("start", 1).to_list(PROGRESS_MAX_POINTS + 1)
+        points = [
+            {
+                "t": r["start"],
+                "count": r["count"],
+                "average": round(r["sum"] / r["count"], 1),
+                "min": r["min"],
+                "max": r["max"]
+            }
+            for r in rollups
+        ]
     
-    return {"message": "Answer submitted"}
+    return {
+        "kind": kind,
+        "category": category,
+        "resolution": resolution,
+        "start": start_day.isoformat(),
+        "end": end_day.isoformat(),
+        "points": points
+    }
 
 # Interview Routes
+INTERVIEW_RESPONSE_BUCKET_SIZE = 50
+
+async def store_interview_responses(session_id, user_id, responses):
+    """
+    Append responses to the session's current interview_responses bucket,
+    opening a new bucket once the current one holds INTERVIEW_RESPONSE_BUCKET_SIZE
+    """
+    await db.interview_responses.update_one(
+        {"session_id": session_id, "count": {"$lte": INTERVIEW_RESPONSE_BUCKET_SIZE - len(responses)}},
+        {
+            "$push": {"responses": {"$each": responses}},
+            "$inc": {"count": len(responses)},
+            "$setOnInsert": {
+                "id": str(uuid.uuid4()),
+                "user_id": user_id,
+                "created_at": datetime.now(timezone.utc).isoformat()
+            }
+        },
+        upsert=True
+    )
+
+async def fetch_interview_responses(session_ids, fields=None):
+    """
+    Load bucketed responses for the given sessions, returned as
+    {session_id: [response, ...]} in submission order. With ``fields``, only
+    those response sub-fields (dotted paths allowed) are read.
+    """
+    projection = {"_id": 0, "session_id": 1}
+    if fields is None:
+        projection["responses"] = 1
+    else:
+        projection.update({f"responses.{field}": 1 for field in fields})
+    
+    responses = {session_id: [] for session_id in session_ids}
+    cursor = db.interview_responses.find({"session_id": {"$in": list(session_ids)}}, projection).sort("created_at", 1)
+    async for bucket in cursor:
+        responses[bucket["session_id"]].extend(bucket.get("responses", []))
+    return responses
+
+async def complete_interview_session(user_id, session_id, session_type, total_questions, answered, aggregates):
+    """
+    Mark a session completed once ``answered`` covers every question, and
+    record its average overall score as the session's one score_history point.
+    The completed flag is flipped conditionally, so of concurrent submits only
+    one records the point.
+    """
+    count = aggregates.get("count", 0)
+    if not count or answered < total_questions:
+        return
+    score = round(aggregates.get("overall_score", 0) / count, 1)
+    result = await db.interview_sessions.update_one(
+        {"id": session_id, "completed": {"$ne": True}},
+        {"$set": {"completed": True, "score": round(score)}}
+    )
+    if result.modified_count:
+        await record_score(user_id, "interview", session_type, score, session_id)
+
+async def load_open_interview_session(session_id, user_id, responses):
+    """
+    The session a submit goes to, checked to be the user's, not completed,
+    and to hold each question the responses answer, each answered once
+    """
+    session = await db.interview_sessions.find_one(
+        {"id": session_id, "user_id": user_id},
+        {"_id": 0, "type": 1, "questions.id": 1, "completed": 1}
+    )
+    if not session:
+        raise HTTPException(status_code=404, detail="Session not found")
+    if session.get("completed"):
+        raise HTTPException(status_code=409, detail="Interview session already completed")
+    
+    question_ids = [response.get("question_id") for response in responses]
+    session_question_ids = {question["id"] for question in session.get("questions", [])}
+    unknown = [question_id for question_id in question_ids if question_id not in session_question_ids]
+    if unknown:
+        raise HTTPException(status_code=400, detail=f"Questions not in this session: {unknown}")
+    if len(set(question_ids)) != len(question_ids):
+        raise HTTPException(status_code=400, detail="Each question can be answered only once")
+    return session
+
+async def record_interview_responses(session, session_id, user_id, responses, feedbacks):
+    """
+    Claim the answered questions on the session, fold the feedback into its
+    aggregates and store the responses. The claim only matches while the
+    session is open and none of the questions is answered yet, so a repeated
+    or concurrent submit of a question is rejected instead of counted twice.
+    Returns the updated session aggregates.
+    """
+    question_ids = [response["question_id"] for response in responses]
+    updated_session = await db.interview_sessions.find_one_and_update(
+        {"id": session_id, "completed": {"$ne": True}, "answered_question_ids": {"$nin": question_ids}},
+        {
+            "$addToSet": {"answered_question_ids": {"$each": question_ids}},
+            "$inc": interview_aggregate_increments(*feedbacks)
+        },
+        projection={"_id": 0, "aggregates": 1, "answered_question_ids": 1},
+        return_document=ReturnDocument.AFTER
+    )
+    if not updated_session:
+        current = await db.interview_sessions.find_one({"id": session_id}, {"_id": 0, "completed": 1})
+        if current and current.get("completed"):
+            raise HTTPException(status_code=409, detail="Interview session already completed")
+        raise HTTPException(status_code=409, detail="Question already answered")
+    
+    await store_interview_responses(session_id, user_id, responses)
+    await complete_interview_session(
+        user_id, session_id, session["type"], len(session.get("questions", [])),
+        len(updated_session["answered_question_ids"]), updated_session["aggregates"]
+    )
+    return updated_session["aggregates"]
+
 @api_router.post("/interview/session", response_model=InterviewSession)
 async def create_interview_session(interview_type: str, current_user: dict = Depends(get_current_user)):
     if interview_type not in ["hr", "technical"]:
@@ -782,16 +3133,16 @@ async def create_interview_session(interview_type: str, current_user: dict = Dep
     )
     
     session_dict = prepare_for_mongo(session.dict())
+    # Stamped only here, while the session has no responses: submits leave it alone,
+    # so a session holding responses scored by an older analyzer stays due for rescoring
+    session_dict["scoring_version"] = INTERVIEW_SCORING_VERSION
     await db.interview_sessions.insert_one(session_dict)
     
     return session
 
 @api_router.post("/interview/{session_id}/response")
 async def submit_interview_response(session_id: str, response_data: dict, current_user: dict = Depends(get_current_user)):
-    # Verify session ownership
-    session = await db.interview_sessions.find_one({"id": session_id, "user_id": current_user["id"]})
-    if not session:
-        raise HTTPException(status_code=404, detail="Session not found")
+    session = await load_open_interview_session(session_id, current_user["id"], [response_data])
     
     # Get the question and answer
     question = response_data.get("question", "")
@@ -807,87 +3158,81 @@ async def submit_interview_response(session_id: str, response_data: dict, curren
         "timestamp": datetime.now(timezone.utc).isoformat()
     }
     
-    # Add response to session
-    await db.interview_sessions.update_one(
-        {"id": session_id},
-        {"$push": {"responses": response_with_feedback}}
-    )
+    await record_interview_responses(session, session_id, current_user["id"], [response_with_feedback], [feedback])
     
     return {
         "message": "Response submitted with AI feedback",
         "feedback": feedback
     }
 
+@api_router.post("/interview/{session_id}/responses")
+async def submit_interview_responses(session_id: str, batch: InterviewResponseBatch, current_user: dict = Depends(get_current_user)):
+    """Submit all answers of an interview session in one request"""
+    if not batch.responses:
+        raise HTTPException(status_code=400, detail="No responses provided")
+    if len(batch.responses) > INTERVIEW_RESPONSE_BUCKET_SIZE:
+        raise HTTPException(status_code=400, detail=f"At most {INTERVIEW_RESPONSE_BUCKET_SIZE} responses per request")
+    
+    session = await load_open_interview_session(session_id, current_user["id"], batch.responses)
+    
+    # Score the whole batch off the event loop, in a copy of the request's context
+    # so that the analysis time is reported in its Server-Timing
+    loop = asyncio.get_running_loop()
+    feedbacks = await loop.run_in_executor(
+        None, contextvars.copy_context().run, score_interview_responses, batch.responses, session["type"]
+    )
+    
+    timestamp = datetime.now(timezone.utc).isoformat()
+    responses_with_feedback = [
+        {**response, "feedback": feedback, "timestamp": timestamp}
+        for response, feedback in zip(batch.responses, feedbacks)
+    ]
+    
+    # One session update claiming the questions and returning the new totals, one bucket write
+    aggregates = await record_interview_responses(session, session_id, current_user["id"], responses_with_feedback, feedbacks)
+    
+    return {
+        "message": f"{len(feedbacks)} responses submitted with AI feedback",
+        "feedback": [
+            {"question_id": response.get("question_id"), "feedback": feedback}
+            for response, feedback in zip(batch.responses, feedbacks)
+        ],
+        "session_feedback": build_interview_feedback_summary(session["type"], aggregates)
+    }
+
 @api_router.get("/interview/{session_id}/feedback")
-async def get_interview_feedback(session_id: str, current_user: dict = Depends(get_current_user)):
+async def get_interview_feedback(session_id: str, include_responses: bool = False, current_user: dict = Depends(get_current_user)):
     """Get comprehensive feedback for completed interview session"""
-    session = await db.interview_sessions.find_one({"id": session_id, "user_id": current_user["id"]})
+    projection = {"_id": 0, "type": 1, "aggregates": 1}
+    if include_responses:
+        projection["responses"] = 1
+    
+    session = await db.interview_sessions.find_one({"id": session_id, "user_id": current_user["id"]}, projection)
     if not session:
         raise HTTPException(status_code=404, detail="Session not found")
     
-    session_data = parse_from_mongo(session)
-    responses = session_data.get("responses", [])
-    
-    if not responses:
+    aggregates = session.get("aggregates") or {}
+    if not aggregates.get("count"):
+        # Sessions recorded before aggregates existed: rebuild them from the responses once
+        responses = session.get("responses")
+        if responses is None:
+            legacy = await db.interview_sessions.find_one({"id": session_id}, {"_id": 0, "responses": 1})
+            responses = (legacy or {}).get("responses", [])
+        aggregates = build_interview_aggregates(responses)
+        if aggregates["count"]:
+            await db.interview_sessions.update_one({"id": session_id}, {"$set": {"aggregates": aggregates}})
+    
+    if not aggregates["count"]:
         raise HTTPException(status_code=400, detail="No responses found for feedback")
     
-    # Calculate overall session metrics
-    total_score = sum(r.get("feedback", {}).get("overall_score", 0) for r in responses)
-    avg_score = total_score / len(responses) if responses else 0
-    
-    total_communication = sum(r.get("feedback", {}).get("communication_score", 0) for r in responses)
-    avg_communication = total_communication / len(responses) if responses else 0
-    
-    total_content = sum(r.get("feedback", {}).get("content_score", 0) for r in responses)
-    avg_content = total_content / len(responses) if responses else 0
+    result = build_interview_feedback_summary(session.get("type"), aggregates)
     
-    total_confidence = sum(r.get("feedback", {}).get("confidence_score", 0) for r in responses)
-    avg_confidence = total_confidence / len(responses) if responses else 0
-    
-    # Collect all strengths and improvements
-    all_strengths = []
-    all_improvements = []
-    
-    for response in responses:
-        feedback = response.get("feedback", {})
-        all_strengths.extend(feedback.get("strengths", []))
-        all_improvements.extend(feedback.get("improvements", []))
-    
-    # Remove duplicates and get top items
-    unique_strengths = list(set(all_strengths))[:5]
-    unique_improvements = list(set(all_improvements))[:5]
-    
-    # Generate overall performance level
-    if avg_score >= 80:
-        performance_level = "Excellent"
-        recommendation = "You're well-prepared! Focus on maintaining confidence and continue practicing."
-    elif avg_score >= 65:
-        performance_level = "Good"
-        recommendation = "You're on the right track. Work on the improvement areas to reach excellence."
-    elif avg_score >= 50:
-        performance_level = "Average"
-        recommendation = "Significant improvement needed. Practice more structured answers with examples."
-    else:
-        performance_level = "Needs Improvement"
-        recommendation = "Focus on fundamental interview skills. Practice basic questions and build confidence."
+    if include_responses:
+        bucketed = await fetch_interview_responses([session_id])
+        responses = session.get("responses", []) + bucketed[session_id]
+        result["individual_responses"] = [parse_from_mongo(r) for r in responses]
     
-    return {
-        "session_summary": {
-            "type": session_data.get("type"),
-            "total_questions": len(responses),
-            "overall_score": round(avg_score, 1),
-            "performance_level": performance_level
-        },
-        "detailed_scores": {
-            "communication": round(avg_communication, 1),
-            "content": round(avg_content, 1),
-            "confidence": round(avg_confidence, 1)
-        },
-        "strengths": unique_strengths,
-        "improvements": unique_improvements,
-        "recommendation": recommendation,
-        "individual_responses": responses
-    }
+    return result
 
 @api_router.get("/learning/youtube-recommendations")
 async def get_youtube_recommendations(current_user: dict = Depends(get_current_user)):
@@ -919,11 +3264,16 @@ async def get_youtube_recommendations(current_user: dict = Depends(get_current_u
         # Get recent interview feedback to identify weak areas
         weak_areas = []
         recent_interviews = await db.interview_sessions.find(
-            {"user_id": current_user["id"]}
+            {"user_id": current_user["id"]},
+            {"_id": 0, "id": 1, "responses.feedback.improvements": 1}
         ).sort("created_at", -1).limit(3).to_list(3)
         
+        bucketed = await fetch_interview_responses(
+            [interview["id"] for interview in recent_interviews],
+            fields=["feedback.improvements"]
+        )
         for interview in recent_interviews:
-            for response in interview.get("responses", []):
+            for response in interview.get("responses", []) + bucketed[interview["id"]]:
                 feedback = response.get("feedback", {})
                 weak_areas.extend(feedback.get("improvements", []))
         
@@ -972,6 +3322,7 @@ def extract_text_from_docx(file_content):
         print(f"Error extracting DOCX text: {e}")
         return ""
 
+@timed_analysis("analyze_resume_content")
 def analyze_resume_content(resume_text, user_branch="Computer Science"):
     """
     Comprehensive AI-powered resume analysis and scoring
@@ -1219,6 +3570,51 @@ def analyze_resume_content(resume_text, user_branch="Computer Science"):
     
     return analysis
 
+# Interview answer lexicons, built once at import instead of on every call
+INTERVIEW_LEXICONS = {
+    "hr_positive": (
+        "experience", "team", "project", "challenge", "learn", "growth", 
+        "passion", "goal", "achievement", "collaboration", "leadership",
+        "problem-solving", "dedication", "opportunity", "contribute"
+    ),
+    "technical": (
+        "algorithm", "data structure", "programming", "code", "development",
+        "framework", "database", "api", "testing", "optimization", "design pattern",
+        "architecture", "scalability", "performance", "debugging", "version control"
+    ),
+    "structure": ("first", "second", "finally", "because", "however", "therefore", "for example"),
+    "confidence_boosters": ("confident", "believe", "experienced", "skilled", "capable", "successful"),
+    "uncertainty": ("maybe", "perhaps", "not sure", "i think", "probably", "might")
+}
+
+# Word counts above this are all scored alike
+INTERVIEW_WORD_COUNT_CAP = 200
+
+# The lexicons whose hits are counted for each interview type: its content
+# lexicon and the confidence ones; None for any other type
+INTERVIEW_COUNTED_LEXICONS = {
+    interview_type: tuple((name, INTERVIEW_LEXICONS[name]) for name in names)
+    for interview_type, names in (
+        ("hr", ("hr_positive", "confidence_boosters", "uncertainty")),
+        ("technical", ("technical", "confidence_boosters", "uncertainty")),
+        (None, ("confidence_boosters", "uncertainty"))
+    )
+}
+
+def count_lexicon_hits(text_lower, interview_type):
+    """
+    Count distinct keyword hits in an already lowercased text, for the
+    interview type's lexicons only. A keyword counts once if it appears
+    anywhere as a substring. Only whether the answer has any structure word
+    matters, so that scan stops at the first one.
+    """
+    contains = text_lower.__contains__
+    hits = {"structure": any(map(contains, INTERVIEW_LEXICONS["structure"]))}
+    for name, keywords in INTERVIEW_COUNTED_LEXICONS.get(interview_type, INTERVIEW_COUNTED_LEXICONS[None]):
+        hits[name] = sum(map(contains, keywords))
+    return hits
+
+@timed_analysis("analyze_interview_response")
 def analyze_interview_response(question, answer, interview_type):
     """
     Analyze interview response and provide detailed feedback
@@ -1245,36 +3641,18 @@ def analyze_interview_response(question, answer, interview_type):
         return feedback
     
     answer_lower = answer.lower()
-    word_count = len(answer.split())
+    # Only thresholds up to 200 words matter, so splitting stops past them
+    word_count = len(answer.split(None, INTERVIEW_WORD_COUNT_CAP))
+    hits = count_lexicon_hits(answer_lower, interview_type)
     
     # Content Analysis
     content_score = 50  # Base score
     
-    # Check for specific keywords based on interview type
+    # Boost score for keywords relevant to the interview type
     if interview_type == "hr":
-        positive_keywords = [
-            "experience", "team", "project", "challenge", "learn", "growth", 
-            "passion", "goal", "achievement", "collaboration", "leadership",
-            "problem-solving", "dedication", "opportunity", "contribute"
-        ]
-        technical_keywords = ["skills", "technical", "programming", "development"]
-        
-        # Boost score for HR-relevant content
-        for keyword in positive_keywords:
-            if keyword in answer_lower:
-                content_score += 5
-                
+        content_score += 5 * hits["hr_positive"]
     elif interview_type == "technical":
-        technical_keywords = [
-            "algorithm", "data structure", "programming", "code", "development",
-            "framework", "database", "api", "testing", "optimization", "design pattern",
-            "architecture", "scalability", "performance", "debugging", "version control"
-        ]
-        
-        # Boost score for technical content
-        for keyword in technical_keywords:
-            if keyword in answer_lower:
-                content_score += 6
+        content_score += 6 * hits["technical"]
     
     # Communication Analysis
     communication_score = 60  # Base score
@@ -1288,26 +3666,13 @@ def analyze_interview_response(question, answer, interview_type):
         communication_score += 5
     
     # Check for structured response
-    structure_indicators = ["first", "second", "finally", "because", "however", "therefore", "for example"]
-    for indicator in structure_indicators:
-        if indicator in answer_lower:
-            communication_score += 5
-            break
+    if hits["structure"]:
+        communication_score += 5
     
     # Confidence Analysis
     confidence_score = 55  # Base score
-    
-    # Positive confidence indicators
-    confidence_boosters = ["confident", "believe", "experienced", "skilled", "capable", "successful"]
-    uncertainty_words = ["maybe", "perhaps", "not sure", "i think", "probably", "might"]
-    
-    for booster in confidence_boosters:
-        if booster in answer_lower:
-            confidence_score += 8
-    
-    for uncertainty in uncertainty_words:
-        if uncertainty in answer_lower:
-            confidence_score -= 5
+    confidence_score += 8 * hits["confidence_boosters"]
+    confidence_score -= 5 * hits["uncertainty"]
     
     # Calculate overall score
     overall_score = (content_score + communication_score + confidence_score) / 3
@@ -1356,6 +3721,95 @@ def analyze_interview_response(question, answer, interview_type):
     
     return feedback
 
+# Bump whenever analyze_interview_response scoring changes; rescore_interviews.py
+# brings stored sessions up to date
+INTERVIEW_SCORING_VERSION = 1
+
+INTERVIEW_SCORE_FIELDS = ("overall_score", "communication_score", "content_score", "confidence_score")
+
+def interview_aggregate_increments(*feedbacks):
+    """
+    Build the $inc document that folds response feedback into
+    interview_sessions.aggregates: a response count, per-score totals and
+    frequency maps of strengths and improvements
+    """
+    increments = {"aggregates.count": len(feedbacks)}
+    for field in INTERVIEW_SCORE_FIELDS:
+        increments[f"aggregates.{field}"] = sum(feedback.get(field, 0) for feedback in feedbacks)
+    for feedback in feedbacks:
+        for kind in ("strengths", "improvements"):
+            for text in feedback.get(kind, []):
+                path = f"aggregates.{kind}.{mongo_key(text)}"
+                increments[path] = increments.get(path, 0) + 1
+    return increments
+
+def build_interview_aggregates(responses):
+    """Compute the aggregates document from stored responses in one pass"""
+    aggregates = {"count": 0, "strengths": {}, "improvements": {}}
+    aggregates.update({field: 0 for field in INTERVIEW_SCORE_FIELDS})
+    for response in responses:
+        feedback = response.get("feedback", {})
+        aggregates["count"] += 1
+        for field in INTERVIEW_SCORE_FIELDS:
+            aggregates[field] += feedback.get(field, 0)
+        for kind in ("strengths", "improvements"):
+            for text in feedback.get(kind, []):
+                key = mongo_key(text)
+                aggregates[kind][key] = aggregates[kind].get(key, 0) + 1
+    return aggregates
+
+def summarize_interview_aggregates(aggregates, top_n=5):
+    """Average scores and most frequent strengths/improvements from an aggregates document"""
+    count = aggregates.get("count", 0)
+    summary = {field: aggregates.get(field, 0) / count if count else 0 for field in INTERVIEW_SCORE_FIELDS}
+    for kind in ("strengths", "improvements"):
+        ranked = sorted((aggregates.get(kind) or {}).items(), key=lambda item: -item[1])
+        summary[kind] = [from_mongo_key(key) for key, _ in ranked[:top_n]]
+    return summary
+
+def score_interview_responses(responses, interview_type):
+    """Run analyze_interview_response over a batch of {question, answer} items"""
+    return [
+        analyze_interview_response(response.get("question", ""), response.get("answer", ""), interview_type)
+        for response in responses
+    ]
+
+def build_interview_feedback_summary(session_type, aggregates):
+    """Session-level feedback report computed from an aggregates document"""
+    summary = summarize_interview_aggregates(aggregates)
+    avg_score = summary["overall_score"]
+    
+    # Generate overall performance level
+    if avg_score >= 80:
+        performance_level = "Excellent"
+        recommendation = "You're well-prepared! Focus on maintaining confidence and continue practicing."
+    elif avg_score >= 65:
+        performance_level = "Good"
+        recommendation = "You're on the right track. Work on the improvement areas to reach excellence."
+    elif avg_score >= 50:
+        performance_level = "Average"
+        recommendation = "Significant improvement needed. Practice more structured answers with examples."
+    else:
+        performance_level = "Needs Improvement"
+        recommendation = "Focus on fundamental interview skills. Practice basic questions and build confidence."
+    
+    return {
+        "session_summary": {
+            "type": session_type,
+            "total_questions": aggregates.get("count", 0),
+            "overall_score": round(avg_score, 1),
+            "performance_level": performance_level
+        },
+        "detailed_scores": {
+            "communication": round(summary["communication_score"], 1),
+            "content": round(summary["content_score"], 1),
+            "confidence": round(summary["confidence_score"], 1)
+        },
+        "strengths": summary["strengths"],
+        "improvements": summary["improvements"],
+        "recommendation": recommendation
+    }
+
 def generate_youtube_recommendations(user_skills, user_branch, weak_areas=None):
     """
     Generate personalized YouTube learning resources based on user profile
@@ -1667,6 +4121,7 @@ def get_match_explanation(user_skills, company_data, scores):
     
     return explanations
 
+@timed_analysis("analyze_linkedin_and_match_companies")
 def analyze_linkedin_and_match_companies(linkedin_data):
     """Main function to analyze LinkedIn data and match with companies"""
     # Extract user profile information
@@ -1855,36 +4310,97 @@ async def get_user_applications(current_user: dict = Depends(get_current_user)):
     except Exception as e:
         print(f"Error fetching applications: {str(e)}")
         raise HTTPException(status_code=500, detail="Failed to fetch applications")
-@api_router.get("/dashboard")
-async def get_dashboard_data(current_user: dict = Depends(get_current_user)):
-    # Get recent projects
-    projects = await db.projects.find({"user_id": current_user["id"]}).sort("created_at", -1).limit(5).to_list(5)
+DASHBOARD_RECENT_PROJECTS = 5
+DASHBOARD_RECENT_TASKS = 10
+DASHBOARD_VIEW_MAX_AGE = timedelta(hours=24)
+
+async def fetch_recent_projects_with_tasks(user_id, project_limit=DASHBOARD_RECENT_PROJECTS, task_limit=DASHBOARD_RECENT_TASKS):
+    """
+    The user's most recent projects and the most recent tasks across them,
+    read with one aggregation that joins each project's newest tasks
+    """
+    pipeline = [
+        {"$match": {"user_id": user_id}},
+        {"$sort": {"created_at": -1}},
+        {"$limit": project_limit},
+        {"$lookup": {
+            "from": "tasks",
+            "localField": "id",
+            "foreignField": "project_id",
+            "pipeline": [
+                {"$sort": {"created_at": -1}},
+                {"$limit": task_limit},
+                {"$project": {"_id": 0}}
+            ],
+            "as": "recent_tasks"
+        }},
+        {"$project": {"_id": 0}}
+    ]
+    projects = await db.projects.aggregate(pipeline).to_list(project_limit)
     
-    # Get recent tasks
-    project_ids = [p["id"] for p in projects]
-    tasks = await db.tasks.find({"project_id": {"$in": project_ids}}).sort("created_at", -1).limit(10).to_list(10)
+    # The overall newest tasks are among each project's own newest task_limit
+    tasks = [task for project in projects for task in project.pop("recent_tasks")]
+    tasks.sort(key=lambda task: task.get("created_at", ""), reverse=True)
+    return projects, tasks[:task_limit]
+
+async def refresh_dashboard_projects(user_id):
+    """Recompute the recent projects and tasks of an existing dashboard view"""
+    projects, tasks = await fetch_recent_projects_with_tasks(user_id)
+    await db.dashboard_views.update_one(
+        {"user_id": user_id},
+        {"$set": {"recent_projects": projects, "recent_tasks": tasks}}
+    )
+
+async def rebuild_dashboard_view(user_id):
+    """Build a user's dashboard_views document from the source collections"""
+    # Projects with their tasks and the quiz rollup are independent reads, run them together
+    (projects, tasks), quiz_rollup = await asyncio.gather(
+        fetch_recent_projects_with_tasks(user_id),
+        db.quiz_stats.find_one({"user_id": user_id, "category": "all"}, {"_id": 0})
+    )
+    if quiz_rollup is None or not quiz_rollup.get("rebuilt_at"):
+        quiz_rollup = (await rebuild_quiz_stats(user_id))["all"]
     
-    # Get quiz progress
-    quiz_sessions = await db.quiz_sessions.find({"user_id": current_user["id"]}).to_list(50)
+    view = {
+        "user_id": user_id,
+        "recent_projects": projects,
+        "recent_tasks": tasks,
+        "quiz_stats": quiz_rollup,
+        "rebuilt_at": datetime.now(timezone.utc).isoformat()
+    }
+    await db.dashboard_views.replace_one({"user_id": user_id}, view, upsert=True)
+    return view
+
+@api_router.get("/dashboard")
+async def get_dashboard_data(current_user: dict = Depends(get_current_user)):
+    # One keyed read of the materialized view; the write paths keep it current
+    view = await db.dashboard_views.find_one({"user_id": current_user["id"]}, {"_id": 0})
+    # Rebuild when missing, and daily so that anything a write path missed heals
+    stale_before = (datetime.now(timezone.utc) - DASHBOARD_VIEW_MAX_AGE).isoformat()
+    if view is None or view.get("rebuilt_at", "") < stale_before:
+        view = await rebuild_dashboard_view(current_user["id"])
     
     return {
-        "recent_projects": [parse_from_mongo(p) for p in projects],
-        "recent_tasks": [parse_from_mongo(t) for t in tasks],
-        "quiz_stats": {
-            "total_sessions": len(quiz_sessions),
-            "average_score": sum(s.get("score", 0) for s in quiz_sessions) / len(quiz_sessions) if quiz_sessions else 0
-        }
+        "recent_projects": [with_progress(parse_from_mongo(p)) for p in view["recent_projects"]],
+        "recent_tasks": [parse_from_mongo(t) for t in view["recent_tasks"]],
+        "quiz_stats": summarize_quiz_stats(view["quiz_stats"])
     }
 
 # Profile Routes
+# Only these are user-editable; email, password and the rest go through their own flows
+PROFILE_EDITABLE_FIELDS = ("name", "college", "branch", "year", "profile_picture", "skills", "experience", "projects")
+
 @api_router.put("/profile")
 async def update_profile(profile_data: dict, current_user: dict = Depends(get_current_user)):
-    update_data = prepare_for_mongo(profile_data)
-    await db.users.update_one({"id": current_user["id"]}, {"$set": update_data})
-    
-    updated_user = await db.users.find_one({"id": current_user["id"]})
+    update_data = prepare_for_mongo({key: value for key, value in profile_data.items() if key in PROFILE_EDITABLE_FIELDS})
+    updated_user = await db.users.find_one_and_update(
+        {"id": current_user["id"]},
+        {"$set": update_data},
+        projection={"_id": 0, "password": 0},
+        return_document=ReturnDocument.AFTER
+    )
     user_data = parse_from_mongo(updated_user)
-    user_data.pop("password", None)
+    quiz_leaderboard.move(current_user["id"], current_user.get("college"), user_data.get("college"))
     
     return user_data
 
@@ -2043,6 +4559,97 @@ def validate_file_type(filename: str, allowed_extensions: set) -> bool:
 async def root():
     return {"message": "Engineering Student Success Platform API"}
 
+@app.get("/system/db-pool", include_in_schema=False)
+async def get_db_pool_stats():
+    """
+    Connection pool use of this server process. Every process has its own
+    pool, so the connections a deployment can open are its worker count
+    times maxPoolSize. Served outside /api next to /metrics.
+    """
+    pool_options = client.options.pool_options
+    return {
+        "pid": os.getpid(),
+        "max_pool_size": pool_options.max_pool_size,
+        "min_pool_size": pool_options.min_pool_size,
+        "wait_queue_timeout": pool_options.wait_queue_timeout,
+        "compressors": mongo_options.get("compressors", ""),
+        **db_pool_metrics.snapshot()
+    }
+
+@app.get("/metrics", include_in_schema=False)
+async def metrics():
+    """
+    Prometheus exposition of request, MongoDB command, connection pool and
+    analysis metrics. Served outside /api, so it is only reachable from inside
+    the deployment, not through the ingress. With several workers the pool
+    metrics are those of the worker serving the scrape, labelled with its pid.
+    """
+    registry = REGISTRY
+    if os.environ.get("PROMETHEUS_MULTIPROC_DIR"):
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+        registry.register(PoolMetricsCollector(db_pool_metrics, pid_label=True))
+    return Response(generate_latest(registry), media_type=CONTENT_TYPE_LATEST)
+
+@functools.lru_cache(maxsize=4096)
+def route_template(method, path):
+    """The path template of the route serving a request, keeping metric labels bounded"""
+    scope = {"type": "http", "method": method, "path": path, "root_path": ""}
+    partial = None
+    for route in app.router.routes:
+        match, _ = route.matches(scope)
+        if match == Match.FULL:
+            return route.path
+        if match == Match.PARTIAL and partial is None:
+            partial = route.path
+    return partial or "unmatched"
+
+class MetricsMiddleware:
+    """
+    ASGI middleware recording request counts, latency and in-flight requests
+    per route. It also adds a Server-Timing header with the request's
+    RequestTiming breakdown, and logs requests slower than SLOW_REQUEST_MS
+    with that breakdown. Event streams are not logged, since they are meant
+    to stay open.
+    """
+    
+    def __init__(self, app):
+        self.app = app
+    
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        method = scope["method"]
+        route = route_template(method, scope["path"])
+        status = 500
+        streaming = False
+        timing = RequestTiming()
+        
+        async def send_with_timing(message):
+            nonlocal status, streaming
+            if message["type"] == "http.response.start":
+                status = message["status"]
+                headers = MutableHeaders(scope=message)
+                streaming = headers.get("content-type", "").startswith("text/event-stream")
+                headers.append("Server-Timing", timing.server_timing(time.perf_counter() - started))
+            await send(message)
+        
+        in_progress = HTTP_REQUESTS_IN_PROGRESS.labels(method, route)
+        in_progress.inc()
+        context_token = request_timing.set(timing)
+        started = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_with_timing)
+        finally:
+            elapsed = time.perf_counter() - started
+            request_timing.reset(context_token)
+            in_progress.dec()
+            HTTP_REQUEST_SECONDS.labels(method, route).observe(elapsed)
+            HTTP_REQUESTS.labels(method, route, str(status)).inc()
+            if elapsed >= SLOW_REQUEST_SECONDS and not streaming:
+                logger.warning(f"Slow request {method} {scope['path']} ({status}): {timing.server_timing(elapsed)}")
+
 # Include the router in the main app
 app.include_router(api_router)
 
@@ -2052,7 +4659,10 @@ app.add_middleware(
     allow_origins=os.environ.get('CORS_ORIGINS', '*').split(','),
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Next-Cursor", "Server-Timing"],
 )
+# Added last so it is outermost and times the other middleware too
+app.add_middleware(MetricsMiddleware)
 
 # Configure logging
 logging.basicConfig(
@@ -2061,6 +4671,78 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+@app.on_event("startup")
+async def create_indexes():
+    await db.interview_responses.create_index([("session_id", 1), ("created_at", 1)])
+    await db.interview_responses.create_index("user_id")
+    try:
+        await db.quiz_answers.create_index([("session_id", 1), ("question_id", 1)], unique=True)
+    except OperationFailure as e:
+        logger.error(f"quiz_answers has repeated answers, unique index not created: {e}")
+    await db.quiz_stats.create_index([("user_id", 1), ("category", 1)], unique=True)
+    await db.code_submissions.create_index([("user_id", 1), ("created_at", -1)])
+    # Keyset pagination walks (created_at, id); the dashboard walks the same indexes backwards
+    await db.projects.create_index([("user_id", 1), ("created_at", 1), ("id", 1)])
+    await db.tasks.create_index([("project_id", 1), ("created_at", 1), ("id", 1), ("due_date", 1)])
+    # Due-date range filters bound the scan to the range, but a range cannot yield
+    # (created_at, id) order, so those pages sort the whole range in memory
+    await db.tasks.create_index([("project_id", 1), ("due_date", 1), ("created_at", 1), ("id", 1)])
+    for field in ("status", "priority", "assigned_to"):
+        await db.tasks.create_index([("project_id", 1), (field, 1), ("created_at", 1), ("id", 1)])
+    await db.tasks.create_index([("id", 1), ("user_id", 1)])
+    await db.tasks.create_index([("user_id", 1), ("updated_at", 1), ("id", 1)])
+    await db.projects.create_index([("user_id", 1), ("updated_at", 1), ("id", 1)])
+    await db.tombstones.create_index([("user_id", 1), ("updated_at", 1), ("id", 1)])
+    try:
+        await db.tombstones.create_index([("kind", 1), ("id", 1)], unique=True)
+    except OperationFailure as e:
+        logger.error(f"tombstones has repeated deletions, unique index not created: {e}")
+    for collection in (db.projects, db.tasks):
+        await collection.create_index(
+            [("user_id", 1), ("title", "text"), ("description", "text")],
+            weights=SEARCH_TEXT_WEIGHTS,
+            name="search_text"
+        )
+    await db.tombstones.create_index("deleted_at", expireAfterSeconds=int(TOMBSTONE_RETENTION.total_seconds()))
+    await db.tasks.create_index("due_date")
+    await db.notifications.create_index([("kind", 1), ("task_id", 1), ("due_date", 1)], unique=True)
+    await db.notifications.create_index([("user_id", 1), ("created_at", -1)])
+    await db.dashboard_views.create_index("user_id", unique=True)
+    try:
+        await db.create_collection(
+            "score_history",
+            timeseries={"timeField": "ts", "metaField": "meta", "granularity": "hours"}
+        )
+    except CollectionInvalid:
+        pass  # already created
+    await db.score_history.create_index([("meta.user_id", 1), ("meta.kind", 1), ("meta.category", 1), ("ts", 1)])
+    await db.score_rollups.create_index(
+        [("user_id", 1), ("kind", 1), ("category", 1), ("period", 1), ("start", 1)],
+        unique=True
+    )
+
+@app.on_event("startup")
+async def load_leaderboards():
+    global leaderboard_refresh_task
+    await quiz_leaderboard.load()
+    leaderboard_refresh_task = asyncio.create_task(quiz_leaderboard.refresh_forever(LEADERBOARD_REFRESH_SECONDS))
+
+@app.on_event("startup")
+async def start_code_grader():
+    await coding_grader.start()
+
+@app.on_event("startup")
+async def start_task_reminders():
+    global task_reminder_task
+    await task_reminders.start()
+    task_reminder_task = asyncio.create_task(task_reminders.run_forever())
+
 @app.on_event("shutdown")
 async def shutdown_db_client():
+    await coding_grader.close()
+    if leaderboard_refresh_task is not None:
+        leaderboard_refresh_task.cancel()
+    if task_reminder_task is not None:
+        task_reminder_task.cancel()
+    await quiz_answer_writer.close()
     client.close()
\ No newline at end of file
@@ -0,0 +1,390 @@
+#!/usr/bin/env python3
+"""
+Micro-benchmarks for CPU-bound backend code paths
+Runs in-process against backend/server.py, no running server needed. Only the
+search benchmark needs a database: the MongoDB at MONGO_URL, which it seeds in
+DB_NAME; it is skipped when none is reachable.
+"""
+
+import asyncio
+import os
+import random
+import subprocess
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent / "backend"))
+os.environ.setdefault("MONGO_URL", "mongodb://localhost:27017")
+os.environ.setdefault("DB_NAME", "engisuccess_benchmark")
+
+import server  # noqa: E402
+
+FILLER_WORDS = (
+    "i worked on a small module with my friends during the summer and we spent "
+    "time building features while studying for exams at college then shipped it"
+).split()
+
+def legacy_interview_scores(answer, interview_type):
+    """Keyword scoring and word count as implemented before count_lexicon_hits, kept for comparison"""
+    answer_lower = answer.lower()
+    len(answer.split())
+    content_score = 50
+    if interview_type == "hr":
+        for keyword in server.INTERVIEW_LEXICONS["hr_positive"]:
+            if keyword in answer_lower:
+                content_score += 5
+    elif interview_type == "technical":
+        for keyword in server.INTERVIEW_LEXICONS["technical"]:
+            if keyword in answer_lower:
+                content_score += 6
+    communication_bonus = 0
+    for indicator in server.INTERVIEW_LEXICONS["structure"]:
+        if indicator in answer_lower:
+            communication_bonus = 5
+            break
+    confidence_score = 55
+    for booster in server.INTERVIEW_LEXICONS["confidence_boosters"]:
+        if booster in answer_lower:
+            confidence_score += 8
+    for uncertainty in server.INTERVIEW_LEXICONS["uncertainty"]:
+        if uncertainty in answer_lower:
+            confidence_score -= 5
+    return content_score, communication_bonus, confidence_score
+
+def make_answer(word_count, keyword_ratio=0.05, rng=random):
+    keywords = [k for words in server.INTERVIEW_LEXICONS.values() for k in words]
+    return " ".join(
+        rng.choice(keywords) if rng.random() < keyword_ratio else rng.choice(FILLER_WORDS)
+        for _ in range(word_count)
+    )
+
+def timed(func, *args, repeat=200):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        func(*args)
+    return (time.perf_counter() - start) / repeat * 1e6
+
+def benchmark_interview_analyzer():
+    """Check lexicon counting parity with the legacy scans and time both on long answers"""
+    print("\n=== Interview Response Analyzer ===")
+    rng = random.Random(42)
+
+    # Parity: identical scores on random answers, including dense keywords and odd spacing
+    for _ in range(2000):
+        answer = make_answer(rng.randint(3, 120), keyword_ratio=rng.random(), rng=rng)
+        if rng.random() < 0.2:
+            answer = answer.replace(" ", rng.choice(["  ", "\n", "-", ""]), rng.randint(1, 5))
+        answer_lower = answer.lower()
+        for interview_type in ("hr", "technical"):
+            hits = server.count_lexicon_hits(answer_lower, interview_type)
+            content = 50 + (5 * hits["hr_positive"] if interview_type == "hr" else 6 * hits["technical"])
+            new_scores = (
+                content,
+                5 if hits["structure"] else 0,
+                55 + 8 * hits["confidence_boosters"] - 5 * hits["uncertainty"],
+            )
+            assert new_scores == legacy_interview_scores(answer, interview_type), answer
+    print("Parity with legacy scoring: OK (2000 random answers)")
+
+    def scores(answer):
+        len(answer.split(None, server.INTERVIEW_WORD_COUNT_CAP))
+        return server.count_lexicon_hits(answer.lower(), "technical")
+
+    print(f"{'words':>8} {'legacy us':>12} {'lexicon us':>12} {'full analyze us':>16}")
+    for word_count in (50, 200, 1000, 5000):
+        answer = make_answer(word_count, rng=rng)
+        legacy_us = timed(legacy_interview_scores, answer, "technical")
+        lexicon_us = timed(scores, answer)
+        analyze_us = timed(server.analyze_interview_response, "", answer, "technical")
+        print(f"{word_count:>8} {legacy_us:>12.1f} {lexicon_us:>12.1f} {analyze_us:>16.1f}")
+
+def benchmark_leaderboard(students=100_000, operations=20_000):
+    """Check ScoreBoard ranks against a full sort and time updates, rank and top-N at scale"""
+    print(f"\n=== Quiz Leaderboard ({students} students) ===")
+    rng = random.Random(7)
+    board = server.ScoreBoard()
+    scores = {}
+    start = time.perf_counter()
+    for i in range(students):
+        scores[f"user-{i}"] = rng.randint(0, 2000)
+        board.set(f"user-{i}", scores[f"user-{i}"])
+    print(f"Load: {(time.perf_counter() - start) * 1000:.1f} ms")
+
+    # Parity with ranks derived from a full sort
+    ordered = sorted(scores.values(), reverse=True)
+    first_rank = {}
+    for position, score in enumerate(ordered, 1):
+        first_rank.setdefault(score, position)
+    for user_id in rng.sample(list(scores), 1000):
+        assert board.rank(user_id) == first_rank[scores[user_id]], user_id
+    top = board.top(50)
+    assert [score for _, _, score in top] == ordered[:50]
+    print("Parity with sorted ranks: OK (1000 students, top 50)")
+
+    user_ids = list(scores)
+    updates = [(rng.choice(user_ids), rng.randint(1, 10)) for _ in range(operations)]
+    start = time.perf_counter()
+    for user_id, delta in updates:
+        board.add(user_id, delta)
+    update_us = (time.perf_counter() - start) / operations * 1e6
+
+    lookups = [rng.choice(user_ids) for _ in range(operations)]
+    start = time.perf_counter()
+    for user_id in lookups:
+        board.rank(user_id)
+    rank_us = (time.perf_counter() - start) / operations * 1e6
+
+    top_us = timed(board.top, 10, repeat=2000)
+    scan_us = timed(lambda: sorted(board._scores.items(), key=lambda item: -item[1])[:10], repeat=5)
+    print(f"{'score update us':>16} {'my rank us':>12} {'top-10 us':>10} {'full sort us':>14}")
+    print(f"{update_us:>16.2f} {rank_us:>12.2f} {top_us:>10.2f} {scan_us:>14.1f}")
+
+def percentile(samples, fraction):
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * fraction))]
+
+def benchmark_code_grader(submissions=400, concurrency=32, workers=4):
+    """Throughput and latency percentiles of the grader pool under concurrent submissions"""
+    print(f"\n=== Coding Grader ({workers} workers, {concurrency} concurrent clients) ===")
+    question = server.QUESTION_BANK.get("code_2")
+    # Distinct code per submission so every run misses the result cache
+    codes = [question["sample_answer"] + f"\n# submission {i}" for i in range(submissions)]
+
+    async def run():
+        pool = server.CodeGraderPool(workers=workers)
+        await pool.start()
+        latencies = []
+        queue = list(codes)
+
+        async def client():
+            while queue:
+                code = queue.pop()
+                start = time.perf_counter()
+                result, _ = await pool.grade(question["id"], question["function"], question["test_cases"], code)
+                assert result["status"] == "accepted", result
+                latencies.append((time.perf_counter() - start) * 1000)
+
+        start = time.perf_counter()
+        await asyncio.gather(*(client() for _ in range(concurrency)))
+        elapsed = time.perf_counter() - start
+
+        cached_start = time.perf_counter()
+        for code in codes:
+            await pool.grade(question["id"], question["function"], question["test_cases"], code)
+        cached_us = (time.perf_counter() - cached_start) / len(codes) * 1e6
+        await pool.close()
+        return latencies, elapsed, cached_us
+
+    latencies, elapsed, cached_us = asyncio.run(run())
+    print(f"Sandboxed runs: {submissions / elapsed:.0f} submissions/s, "
+          f"p50 {percentile(latencies, 0.5):.1f} ms, p99 {percentile(latencies, 0.99):.1f} ms")
+    print(f"Cached results: {cached_us:.1f} us per submission")
+
+    # Baseline: a fresh interpreter per submission
+    script = question["sample_answer"] + f"\nassert {question['function']}([1, 3, 5], 5) == 2"
+    cold_ms = timed(lambda: subprocess.run([sys.executable, "-I", "-c", script], check=True), repeat=20) / 1000
+    print(f"Fresh interpreter per submission (sequential): {cold_ms:.1f} ms")
+
+def benchmark_event_fanout(connections=5000, events=200):
+    """
+    Cost of publishing one project event to many SSE subscribers and delivering
+    it to all of them, and the longest the fan-out keeps the event loop from
+    other work
+    """
+    print(f"\n=== Project Event Fan-out ({connections} connections) ===")
+    task = server.prepare_for_mongo(server.Task(title="Write report", project_id="p", user_id="u").dict())
+
+    async def run():
+        hub = server.ProjectEventHub()
+        tracemalloc.start()
+        before = tracemalloc.get_traced_memory()[0]
+        received = [0]
+        target = [0]
+        all_received = asyncio.Event()
+
+        async def client(subscription):
+            # The same loop as the SSE route, minus the socket write
+            while True:
+                batch = await subscription.next(server.SSE_HEARTBEAT_SECONDS)
+                received[0] += len(batch)
+                if received[0] >= target[0]:
+                    all_received.set()
+
+        clients = [asyncio.create_task(client(hub.subscribe("p"))) for _ in range(connections)]
+        await asyncio.sleep(0)
+        per_connection_kb = (tracemalloc.get_traced_memory()[0] - before) / connections / 1024
+        tracemalloc.stop()
+
+        # Another request's view of the loop: the gaps between its turns
+        stalls_ms = []
+
+        async def probe():
+            last = time.perf_counter()
+            while True:
+                await asyncio.sleep(0)
+                now = time.perf_counter()
+                stalls_ms.append((now - last) * 1000)
+                last = now
+
+        probe_task = asyncio.create_task(probe())
+        publish_us = []
+        delivery_ms = []
+        for i in range(events):
+            target[0] = connections * (i + 1)
+            all_received.clear()
+            start = time.perf_counter()
+            hub.publish("p", "task_updated", {**task, "status": "in_progress"})
+            publish_us.append((time.perf_counter() - start) * 1e6)
+            await all_received.wait()
+            delivery_ms.append((time.perf_counter() - start) * 1000)
+        probe_task.cancel()
+
+        # A burst larger than the buffer while no client reads: every subscriber
+        # falls back to a single resync
+        for client_task in clients:
+            client_task.cancel()
+        await asyncio.gather(*clients, return_exceptions=True)
+        for _ in range(hub.buffer_size + 1):
+            hub.publish("p", "task_updated", task)
+        await hub.flush()
+        overflows = hub.stats["overflows"]
+        return publish_us, delivery_ms, stalls_ms, per_connection_kb, overflows
+
+    publish_us, delivery_ms, stalls_ms, per_connection_kb, overflows = asyncio.run(run())
+    print(f"Memory per idle connection: {per_connection_kb:.1f} KiB")
+    print(f"publish (encode + queue) p50 {percentile(publish_us, 0.5):.0f} us, p99 {percentile(publish_us, 0.99):.0f} us")
+    print(f"delivered to all {connections}: p50 {percentile(delivery_ms, 0.5):.1f} ms, p99 {percentile(delivery_ms, 0.99):.1f} ms "
+          f"({percentile(delivery_ms, 0.5) * 1000 / connections:.2f} us per connection)")
+    print(f"Event loop stalls seen by other requests: p99 {percentile(stalls_ms, 0.99):.1f} ms, max {max(stalls_ms):.1f} ms")
+    print(f"Burst past the {server.PROJECT_EVENT_BUFFER}-event buffer: {overflows} subscribers switched to resync")
+
+def benchmark_timing_wheel(timers=1_000_000, span=6 * 3600):
+    """Reminder wheel at a million pending timers: schedule, cancel and per-tick advance cost"""
+    print(f"\n=== Reminder Timing Wheel ({timers} timers over {span // 3600} h) ===")
+    rng = random.Random(11)
+    start_tick = 1_700_000_000
+    wheel = server.TimingWheel(start_tick)
+    expiries = {f"task-{i}": start_tick + rng.randint(1, span) for i in range(timers)}
+
+    start = time.perf_counter()
+    for key, tick in expiries.items():
+        wheel.schedule(key, tick, key)
+    schedule_us = (time.perf_counter() - start) / timers * 1e6
+
+    cancelled = rng.sample(list(expiries), timers // 10)
+    start = time.perf_counter()
+    for key in cancelled:
+        wheel.cancel(key)
+    cancel_us = (time.perf_counter() - start) / len(cancelled) * 1e6
+    for key in cancelled:
+        del expiries[key]
+
+    # Parity: every remaining timer fires exactly once, on its own tick
+    tick_ms = []
+    fired = 0
+    start = time.perf_counter()
+    for tick in range(start_tick + 1, start_tick + span + 1):
+        tick_start = time.perf_counter()
+        due = wheel.advance(tick)
+        tick_ms.append((time.perf_counter() - tick_start) * 1000)
+        for key in due:
+            assert expiries[key] == tick, key
+        fired += len(due)
+    advance_s = time.perf_counter() - start
+    assert fired == len(expiries) and len(wheel) == 0
+    print(f"Parity: {fired} timers fired on their tick, {len(cancelled)} cancelled never fired")
+    print(f"{'schedule us':>12} {'cancel us':>10} {'tick p50 ms':>12} {'tick p99 ms':>12} {'tick max ms':>12}")
+    print(f"{schedule_us:>12.2f} {cancel_us:>10.2f} {percentile(tick_ms, 0.5):>12.3f} "
+          f"{percentile(tick_ms, 0.99):>12.3f} {max(tick_ms):>12.1f}")
+    print(f"Whole {span // 3600} h replayed in {advance_s:.1f} s")
+
+SEARCH_WORDS = (
+    "deploy database index migration report review frontend backend api cache "
+    "login dashboard test release schema query design budget invoice meeting "
+    "slides survey sensor circuit thesis lab robot firmware payment search"
+).split()
+
+def benchmark_search(tasks=1_000_000, users=100, queries=500):
+    """Latency of the search route's $text queries against a seeded collection of a million tasks"""
+    print(f"\n=== Search ({tasks} tasks, {users} users) ===")
+    from motor.motor_asyncio import AsyncIOMotorClient
+    from pymongo.errors import ServerSelectionTimeoutError
+    from starlette.responses import Response
+
+    async def seed(db):
+        """Fill db.tasks with random titles and descriptions, unless an earlier run already did"""
+        if await db.tasks.estimated_document_count() == tasks:
+            return
+        await db.tasks.drop()
+        rng = random.Random(5)
+        batch = []
+        for i in range(tasks):
+            batch.append({
+                "id": f"task-{i}",
+                "user_id": f"user-{i % users}",
+                "project_id": f"project-{i % (users * 10)}",
+                "title": " ".join(rng.choices(SEARCH_WORDS, k=4)),
+                "description": " ".join(rng.choices(SEARCH_WORDS + FILLER_WORDS, k=30)),
+                "status": "todo"
+            })
+            if len(batch) == 10_000:
+                await db.tasks.insert_many(batch, ordered=False)
+                batch = []
+        if batch:
+            await db.tasks.insert_many(batch, ordered=False)
+        # The index the server creates on startup
+        await db.tasks.create_index(
+            [("user_id", 1), ("title", "text"), ("description", "text")],
+            weights=server.SEARCH_TEXT_WEIGHTS,
+            name="search_text"
+        )
+
+    async def run():
+        client = AsyncIOMotorClient(os.environ["MONGO_URL"], serverSelectionTimeoutMS=2000)
+        db = client[os.environ["DB_NAME"]]
+        try:
+            await client.admin.command("ping")
+        except ServerSelectionTimeoutError:
+            client.close()
+            return None
+        start = time.perf_counter()
+        await seed(db)
+        seed_s = time.perf_counter() - start
+        server.db = db
+        rng = random.Random(9)
+        latencies = {"one word": [], "two words": []}
+        for _ in range(queries):
+            for label, words in (("one word", 1), ("two words", 2)):
+                q = " ".join(rng.sample(SEARCH_WORDS, words))
+                user = {"id": f"user-{rng.randrange(users)}"}
+                start = time.perf_counter()
+                await server.search(q, Response(), kind="task", limit=20, cursor=None, current_user=user)
+                latencies[label].append((time.perf_counter() - start) * 1000)
+        client.close()
+        return seed_s, latencies
+
+    result = asyncio.run(run())
+    if result is None:
+        print(f"Skipped: no MongoDB reachable at {os.environ['MONGO_URL']}")
+        return
+    seed_s, latencies = result
+    print(f"Seeded or reused in {seed_s:.1f} s; {tasks // users} tasks per user")
+    print(f"{'query':>10} {'p50 ms':>8} {'p99 ms':>8} {'max ms':>8}")
+    for label, samples in latencies.items():
+        print(f"{label:>10} {percentile(samples, 0.5):>8.1f} {percentile(samples, 0.99):>8.1f} {max(samples):>8.1f}")
+
+def run_all_benchmarks():
+    print("=" * 60)
+    print("ENGINEERING STUDENT SUCCESS PLATFORM - BACKEND BENCHMARKS")
+    print("=" * 60)
+    benchmark_interview_analyzer()
+    benchmark_leaderboard()
+    benchmark_code_grader()
+    benchmark_event_fanout()
+    benchmark_timing_wheel()
+    benchmark_search()
+
+if __name__ == "__main__":
+    run_all_benchmarks()
@@ -293,6 +293,52 @@ class BackendTester:
             print(f"Task status update error: {str(e)}")
             return False
 
+    def test_bulk_task_operations(self):
+        """Test creating, updating and deleting tasks in one bulk request"""
+        print("\n=== Testing Bulk Task Operations ===")
+        try:
+            headers = {"Authorization": f"Bearer {self.auth_token}"}
+            operations = [
+                {"op": "create", "data": {"title": "Write unit tests", "priority": "high"}},
+                {"op": "create", "data": {"title": "Temporary task"}},
+                {"op": "update", "task_id": self.task_id, "data": {"status": "in_progress"}},
+                {"op": "delete", "task_id": "missing-task-id"}
+            ]
+            response = self.session.post(
+                f"{API_BASE_URL}/projects/{self.project_id}/tasks/bulk",
+                json={"operations": operations},
+                headers=headers
+            )
+            print(f"Bulk task operations status: {response.status_code}")
+            
+            if response.status_code == 200:
+                data = response.json()
+                statuses = [result["status"] for result in data["results"]]
+                print(f"Inserted: {data['inserted']}, modified: {data['modified']}, deleted: {data['deleted']}")
+                print(f"Per-operation results: {statuses}")
+                return statuses == ["created", "created", "updated", "not_found"]
+            else:
+                print(f"Bulk task operations failed: {response.text}")
+                return False
+        except Exception as e:
+            print(f"Bulk task operations error: {str(e)}")
+            return False
+
+    def test_server_timing(self):
+        """Test the Server-Timing breakdown on an authenticated request"""
+        print("\n=== Testing Server-Timing Header ===")
+        try:
+            headers = {"Authorization": f"Bearer {self.auth_token}"}
+            response = self.session.get(f"{API_BASE_URL}/projects/{self.project_id}/tasks", headers=headers)
+            server_timing = response.headers.get("Server-Timing", "")
+            print(f"Server-Timing: {server_timing}")
+            
+            phases = [entry.split(";")[0].strip() for entry in server_timing.split(",")]
+            return response.status_code == 200 and {"auth", "db", "total"} <= set(phases)
+        except Exception as e:
+            print(f"Server-Timing error: {str(e)}")
+            return False
+
     def test_quiz_system(self):
         """Test quiz system functionality"""
         print("\n=== Testing Quiz System ===")
@@ -312,6 +358,10 @@ class BackendTester:
                 if response.status_code == 200:
                     coding_questions = response.json()
                     print(f"Found {len(coding_questions)} coding questions")
+                    hidden = ("correct_answer", "sample_answer", "test_cases")
+                    if any(key in question for question in questions + coding_questions for key in hidden):
+                        print("Public questions expose answers or hidden tests")
+                        return False
                     
                     # Create quiz session
                     headers = {"Authorization": f"Bearer {self.auth_token}"}
@@ -330,8 +380,7 @@ class BackendTester:
                         answer_data = {
                             "session_id": self.quiz_session_id,
                             "question_id": questions[0]["id"],
-                            "selected_answer": questions[0]["correct_answer"],
-                            "is_correct": True
+                            "selected_answer": questions[0]["options"][0]
                         }
                         response = self.session.post(
                             f"{API_BASE_URL}/quiz/answer",
@@ -359,6 +408,40 @@ class BackendTester:
             print(f"Quiz system error: {str(e)}")
             return False
 
+    def test_batch_quiz_submission(self):
+        """Test submitting all quiz answers in one request"""
+        print("\n=== Testing Batch Quiz Submission ===")
+        try:
+            headers = {"Authorization": f"Bearer {self.auth_token}"}
+            response = self.session.post(
+                f"{API_BASE_URL}/quiz/session?category=aptitude",
+                headers=headers
+            )
+            if response.status_code != 200:
+                print(f"Quiz session creation failed: {response.text}")
+                return False
+            
+            session_id = response.json()["id"]
+            questions = response.json()["questions"]
+            answers = [{"question_id": q["id"], "selected_answer": q["options"][i % len(q["options"])]} for i, q in enumerate(questions)]
+            response = self.session.post(
+                f"{API_BASE_URL}/quiz/answers",
+                json={"session_id": session_id, "answers": answers},
+                headers=headers
+            )
+            print(f"Batch quiz submission status: {response.status_code}")
+            
+            if response.status_code == 200:
+                data = response.json()
+                print(f"Score: {data['score']}/{data['total_questions']}")
+                return data["score"] == sum(1 for result in data["results"] if result["is_correct"])
+            else:
+                print(f"Batch quiz submission failed: {response.text}")
+                return False
+        except Exception as e:
+            print(f"Batch quiz submission error: {str(e)}")
+            return False
+
     def test_mock_interview_system(self):
         """Test mock interview system"""
         print("\n=== Testing Mock Interview System ===")
@@ -417,6 +500,62 @@ class BackendTester:
             print(f"Mock interview system error: {str(e)}")
             return False
 
+    def test_batch_interview_submission(self):
+        """Test submitting all interview answers in one request"""
+        print("\n=== Testing Batch Interview Submission ===")
+        try:
+            headers = {"Authorization": f"Bearer {self.auth_token}"}
+            response = self.session.post(
+                f"{API_BASE_URL}/interview/session?interview_type=technical",
+                headers=headers
+            )
+            if response.status_code != 200:
+                print(f"Technical interview creation failed: {response.text}")
+                return False
+            
+            session_data = response.json()
+            batch = {
+                "responses": [
+                    {
+                        "question_id": question["id"],
+                        "question": question["question"],
+                        "answer": "First, I would analyze the algorithm and data structure involved, because performance and scalability matter. For example, I used a database index to optimize an API during my internship project."
+                    }
+                    for question in session_data["questions"]
+                ]
+            }
+            response = self.session.post(
+                f"{API_BASE_URL}/interview/{session_data['id']}/responses",
+                json=batch,
+                headers=headers
+            )
+            print(f"Batch interview submission status: {response.status_code}")
+            
+            if response.status_code == 200:
+                data = response.json()
+                summary = data["session_feedback"]["session_summary"]
+                print(f"Per-answer feedback items: {len(data['feedback'])}")
+                print(f"Session score: {summary['overall_score']} ({summary['performance_level']})")
+                
+                # Every question is answered, so the session is closed to further answers
+                resubmit = self.session.post(
+                    f"{API_BASE_URL}/interview/{session_data['id']}/responses",
+                    json=batch,
+                    headers=headers
+                )
+                print(f"Resubmission status: {resubmit.status_code}")
+                return (
+                    len(data["feedback"]) == len(session_data["questions"])
+                    and summary["total_questions"] == len(session_data["questions"])
+                    and resubmit.status_code == 409
+                )
+            else:
+                print(f"Batch interview submission failed: {response.text}")
+                return False
+        except Exception as e:
+            print(f"Batch interview submission error: {str(e)}")
+            return False
+
     def test_company_information(self):
         """Test company information API"""
         print("\n=== Testing Company Information ===")
@@ -559,8 +698,12 @@ class BackendTester:
             ("Project Update", self.test_update_project),
             ("Task Creation", self.test_create_task),
             ("Task Status Updates", self.test_update_task_status),
+            ("Bulk Task Operations", self.test_bulk_task_operations),
+            ("Server-Timing Header", self.test_server_timing),
             ("Quiz System", self.test_quiz_system),
+            ("Batch Quiz Submission", self.test_batch_quiz_submission),
             ("Mock Interview System", self.test_mock_interview_system),
+            ("Batch Interview Submission", self.test_batch_interview_submission),
             ("Company Information", self.test_company_information),
             ("Dashboard", self.test_dashboard),
             ("Profile Management", self.test_profile_management)
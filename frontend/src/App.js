@@ -654,6 +654,7 @@ const TaskCard = ({ task, onStatusChange }) => {
 const Preparation = () => {
   const [activeTab, setActiveTab] = useState('aptitude');
   const [questions, setQuestions] = useState([]);
+  const [sessionId, setSessionId] = useState(null);
   const [currentQuestionIndex, setCurrentQuestionIndex] = useState(0);
   const [selectedAnswer, setSelectedAnswer] = useState('');
   const [score, setScore] = useState(0);
@@ -663,8 +664,9 @@ const Preparation = () => {
   const startQuiz = async (category) => {
     setLoading(true);
     try {
-      const response = await axios.get(`${API}/quiz/questions/${category}`);
-      setQuestions(response.data);
+      const response = await axios.post(`${API}/quiz/session?category=${category}`);
+      setSessionId(response.data.id);
+      setQuestions(response.data.questions);
       setCurrentQuestionIndex(0);
       setScore(0);
       setShowResults(false);
@@ -676,9 +678,25 @@ const Preparation = () => {
     }
   };
 
-  const submitAnswer = () => {
+  const submitAnswer = async () => {
     const currentQuestion = questions[currentQuestionIndex];
-    const isCorrect = selectedAnswer === currentQuestion.correct_answer;
+    // Answers are graded by the server; questions arrive without them
+    let isCorrect = false;
+    try {
+      if (activeTab === 'coding') {
+        const response = await axios.post(`${API}/quiz/coding/${currentQuestion.id}/submit`, { code: selectedAnswer });
+        isCorrect = response.data.status === 'accepted';
+      } else {
+        const response = await axios.post(`${API}/quiz/answer`, {
+          session_id: sessionId,
+          question_id: currentQuestion.id,
+          selected_answer: selectedAnswer
+        });
+        isCorrect = response.data.is_correct;
+      }
+    } catch (error) {
+      console.error('Failed to submit answer:', error);
+    }
     
     if (isCorrect) {
       setScore(score + 1);
@@ -784,12 +802,6 @@ const Preparation = () => {
                   onChange={(e) => setSelectedAnswer(e.target.value)}
                   rows={10}
                 />
-                {currentQuestion?.sample_answer && (
-                  <details className="sample-answer">
-                    <summary>View Sample Answer</summary>
-                    <pre>{currentQuestion.sample_answer}</pre>
-                  </details>
-                )}
               </div>
             )}
             
@@ -838,19 +850,23 @@ const Interviews = () => {
       answer: answer
     };
 
+    const allResponses = [...responses, response];
+
+    if (currentQuestionIndex < session.questions.length - 1) {
+      setResponses(allResponses);
+      setCurrentQuestionIndex(currentQuestionIndex + 1);
+      setAnswer('');
+      return;
+    }
+
     try {
-      await axios.post(`${API}/interview/${session.id}/response`, response);
-      setResponses([...responses, response]);
-      
-      if (currentQuestionIndex < session.questions.length - 1) {
-        setCurrentQuestionIndex(currentQuestionIndex + 1);
-        setAnswer('');
-      } else {
-        // Interview completed
-        setSession({ ...session, completed: true });
-      }
+      // Submit every answer of the session in a single request
+      await axios.post(`${API}/interview/${session.id}/responses`, { responses: allResponses });
+      setResponses(allResponses);
+      // Interview completed
+      setSession({ ...session, completed: true });
     } catch (error) {
-      console.error('Failed to submit response:', error);
+      console.error('Failed to submit responses:', error);
     }
   };
 